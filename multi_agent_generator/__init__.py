@@ -3,12 +3,34 @@ __version__ = "0.3.0"
 
 from .model_inference import (
     ModelInference,
-    Message
+    Message,
+    create_model_inference,
 )
+from .config import AgentConfig, TaskConfig, ToolConfig
 
-from .frameworks import (
-    create_crewai_code,
-    create_crewai_flow_code,
-    create_langgraph_code,
-    create_react_code
-)
\ No newline at end of file
+_FRAMEWORK_EXPORTS = (
+    "create_crewai_code",
+    "create_crewai_flow_code",
+    "create_langgraph_code",
+    "create_react_code",
+    "create_react_lcel_code",
+)
+
+__all__ = [
+    "ModelInference",
+    "Message",
+    "create_model_inference",
+    "AgentConfig",
+    "TaskConfig",
+    "ToolConfig",
+    *_FRAMEWORK_EXPORTS,
+]
+
+
+def __getattr__(name):
+    # Framework generators are resolved lazily so importing the package does
+    # not pull in every framework module
+    if name in _FRAMEWORK_EXPORTS:
+        from . import frameworks
+        return getattr(frameworks, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,101 +2,208 @@
 """
 Command line interface for multi-agent-generator.
 """
-import argparse
+import contextlib
 import json
-import os
-from dotenv import load_dotenv
-from .generator import AgentGenerator
-from .frameworks import (
-    create_crewai_code,
-    create_crewai_flow_code,
-    create_langgraph_code,
-    create_react_code
-)
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from .generator import DEFAULT_CACHE_DIR, AgentGenerator, MissingCredentialsError
+from .model_inference import load_env_if_needed
+from .prompt_cache import SemanticCache
+from .router import Framework, FrameworkRouter
 
-# Load environment variables from .env file if present
-load_dotenv()
+# Code generator for each --framework choice, looked up on the frameworks
+# package (which imports only the module defining it)
+_DISPATCH = {
+    Framework.CREWAI: "create_crewai_code",
+    Framework.CREWAI_FLOW: "create_crewai_flow_code",
+    Framework.LANGGRAPH: "create_langgraph_code",
+    Framework.REACT: "create_react_code",
+    Framework.REACT_LCEL: "create_react_lcel_code",
+}
 
 
-def main():
-    """Command line entry point."""
-    parser = argparse.ArgumentParser(description="Generate multi-agent AI code")
-    parser.add_argument("prompt", help="Plain English description of what you need")
-    parser.add_argument(
-        "--framework", 
-        choices=["crewai", "crewai-flow", "langgraph", "react", "react-lcel"], 
+def _load_generator(name):
+    from . import frameworks
+    return getattr(frameworks, name)
+
+# Directory holding analyze_prompt results from previous runs
+CACHE_DIR = DEFAULT_CACHE_DIR
+
+
+# Options shared by the argparse parser and the fast path in ``parse_args``
+_OPTIONS = {
+    "--framework": dict(
+        choices=[framework.value for framework in Framework] + ["auto"],
         default="crewai",
-        help="Agent framework to use (default: crewai)"
-    )
-    parser.add_argument(
-        "--process",
+        help="Agent framework to use; auto picks one from the prompt (default: crewai)",
+    ),
+    "--process": dict(
         choices=["sequential", "hierarchical"],
         default="sequential",
-        help="Process type for CrewAI (default: sequential)"
-    )
-    parser.add_argument(
-        "--provider",
+        help="Process type for CrewAI (default: sequential)",
+    ),
+    "--provider": dict(
         default="openai",
-        help="LLM provider to use (e.g., openai, watsonx, ollama, anthropic, groq, etc.)"
-    )
-    parser.add_argument(
-        "--output", 
-        help="Output file path (default: print to console)"
-    )
-    parser.add_argument(
-        "--format",
+        help="LLM provider to use (e.g., openai, watsonx, ollama, anthropic, groq, etc.)",
+    ),
+    "--output": dict(
+        help="Output file path (default: print to console)",
+    ),
+    "--format": dict(
         choices=["code", "json", "both"],
         default="code",
-        help="Output format (default: code)"
-    )
-    
+        help="Output format (default: code)",
+    ),
+    "--no-cache": dict(
+        action="store_true",
+        help="Always query the LLM instead of reusing a cached analysis",
+    ),
+    "--semantic-cache": dict(
+        action="store_true",
+        help="Also reuse analyses of similar prompts (requires sentence-transformers)",
+    ),
+}
+
+
+def _build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate multi-agent AI code")
+    parser.add_argument("prompt", help="Plain English description of what you need")
+    for flag, kwargs in _OPTIONS.items():
+        parser.add_argument(flag, **kwargs)
+    return parser
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+
+    Well-formed invocations are handled by a small loop over ``_OPTIONS``;
+    help requests and anything unexpected go through argparse, which also
+    produces the usage and error messages.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
 
-    args = parser.parse_args()
+    values = {}
+    for flag, kwargs in _OPTIONS.items():
+        dest = flag[2:].replace("-", "_")
+        values[dest] = False if kwargs.get("action") == "store_true" else kwargs.get("default")
+    prompt = None
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        i += 1
+        if arg.startswith("-"):
+            flag, eq, value = arg.partition("=")
+            kwargs = _OPTIONS.get(flag)
+            if kwargs is None:
+                break
+            dest = flag[2:].replace("-", "_")
+            if kwargs.get("action") == "store_true":
+                if eq:
+                    break
+                values[dest] = True
+                continue
+            if not eq:
+                # argparse does not take an option-like token as the value
+                if i == len(argv) or argv[i].startswith("-"):
+                    break
+                value = argv[i]
+                i += 1
+            choices = kwargs.get("choices")
+            if choices is not None and value not in choices:
+                break
+            values[dest] = value
+        elif prompt is None:
+            prompt = arg
+        else:
+            break
+    else:
+        if prompt is not None:
+            return SimpleNamespace(prompt=prompt, **values)
+
+    return _build_parser().parse_args(argv)
+
+
+def main():
+    """Command line entry point."""
+    args = parse_args()
+
+    # Only read a .env file when the shell did not provide credentials
+    load_env_if_needed()
+
+    if args.framework == "auto":
+        args.framework = FrameworkRouter().route_one(args.prompt)
+        print(f"Routing prompt to {args.framework}...")
     
-    # Initialize generator
-    generator = AgentGenerator(provider=args.provider)
+    generator_name = _DISPATCH.get(args.framework)
+    if generator_name is None:
+        print(f"Unsupported framework: {args.framework}")
+        return
+
+    semantic_cache = None
+    if args.semantic_cache and not args.no_cache:
+        if SemanticCache.available():
+            semantic_cache = SemanticCache()
+        else:
+            print("Semantic cache disabled: install numpy and sentence-transformers to use it.")
+
+    # Initialize generator; exact repeats are answered from CACHE_DIR, and
+    # with --semantic-cache similar prompts from the semantic cache
+    generator = AgentGenerator(
+        provider=args.provider,
+        cache_dir=CACHE_DIR,
+        semantic_cache=semantic_cache,
+    )
     print(f"Analyzing prompt using {args.provider.upper()}...")
-    config = generator.analyze_prompt(args.prompt, args.framework)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Import the framework's generator module while the LLM call is in flight
+        generate_future = executor.submit(_load_generator, generator_name)
+        try:
+            config = generator.analyze_prompt(args.prompt, args.framework, use_cache=not args.no_cache)
+        except MissingCredentialsError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        generate = generate_future.result()
     
     # Add process type to config for CrewAI frameworks
-    if args.framework in ["crewai", "crewai-flow"]:
+    if args.framework in (Framework.CREWAI, Framework.CREWAI_FLOW):
         config["process"] = args.process
         print(f"Using {args.process} process for CrewAI...")
     
     # Generate code based on the framework
     print(f"Generating {args.framework} code...")
-    if args.framework == "crewai":
-        code = create_crewai_code(config)
-    elif args.framework == "crewai-flow":
-        code = create_crewai_flow_code(config)
-    elif args.framework == "langgraph":
-        code = create_langgraph_code(config)
-    elif args.framework == "react":
-        code = create_react_code(config)
-    elif args.framework == "react-lcel":
-        from .frameworks.react_generator import create_react_lcel_code
-        code = create_react_lcel_code(config)
 
-    else:
-        print(f"Unsupported framework: {args.framework}")
+    if not args.output and not sys.stdout.isatty():
+        # Piped output: encode once and write the bytes directly, bypassing
+        # the text layer of sys.stdout
+        if args.format == "json":
+            output = json.dumps(config, indent=2)
+        elif args.format == "both":
+            output = f"// Configuration:\n{json.dumps(config, indent=2)}\n\n// Generated Code:\n{generate(config)}"
+        else:
+            output = generate(config)
+        sys.stdout.flush()
+        sys.stdout.buffer.write(output.encode() + b"\n")
+        sys.stdout.buffer.flush()
         return
-    
-    # Prepare output
-    if args.format == "code":
-        output = code
-    elif args.format == "json":
-        output = json.dumps(config, indent=2)
-    else:  # both
-        output = f"// Configuration:\n{json.dumps(config, indent=2)}\n\n// Generated Code:\n{code}"
-    
-    # Write output
+
+    # Write output; generated code is streamed to the destination as it is built
+    with (open(args.output, "w") if args.output else contextlib.nullcontext(sys.stdout)) as out:
+        if args.format == "json":
+            out.write(json.dumps(config, indent=2))
+        else:
+            if args.format == "both":
+                out.write(f"// Configuration:\n{json.dumps(config, indent=2)}\n\n// Generated Code:\n")
+            generate(config, out=out)
+        if not args.output:
+            out.write("\n")
     if args.output:
-        with open(args.output, "w") as f:
-            f.write(output)
         print(f"Output successfully written to {args.output}")
-    else:
-        print(output)
-
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,79 @@
+"""
+Prompt normalization used for cache fingerprints.
+
+``normalize_prompt`` lowercases ASCII letters, collapses runs of whitespace
+into a single space and strips leading/trailing whitespace, so prompts that
+differ only in case or spacing map to the same cache entry.
+
+Short prompts go through ``bytes.lower``/``bytes.split``, which already run in
+C. Very large prompts use a numba-compiled scan when ``numba`` and ``numpy``
+are installed; without them the pure-Python path is used for every size.
+"""
+import hashlib
+
+# Below this size the JIT dispatch overhead outweighs the scan itself
+_JIT_MIN_BYTES = 1 << 16
+
+_jit_kernel = None
+_jit_checked = False
+
+
+def _normalize_bytes_py(buf: bytes) -> bytes:
+    return b" ".join(buf.lower().split())
+
+
+def _load_jit_kernel():
+    """Compile the numba kernel on first use; None if numba is unavailable."""
+    global _jit_kernel, _jit_checked
+    if _jit_checked:
+        return _jit_kernel
+    _jit_checked = True
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True)
+    def normalize_bytes(buf):
+        out = np.empty(buf.shape[0], dtype=np.uint8)
+        n = 0
+        pending_space = False
+        for i in range(buf.shape[0]):
+            c = buf[i]
+            if c == 32 or 9 <= c <= 13:
+                pending_space = n > 0
+                continue
+            if pending_space:
+                out[n] = 32
+                n += 1
+                pending_space = False
+            if 65 <= c <= 90:
+                c += 32
+            out[n] = c
+            n += 1
+        return out[:n]
+
+    def kernel(buf: bytes) -> bytes:
+        return normalize_bytes(np.frombuffer(buf, dtype=np.uint8)).tobytes()
+
+    _jit_kernel = kernel
+    return kernel
+
+
+def normalize_prompt(prompt: str) -> bytes:
+    """Return the normalized UTF-8 bytes of ``prompt``."""
+    buf = prompt.encode()
+    if len(buf) >= _JIT_MIN_BYTES:
+        kernel = _load_jit_kernel()
+        if kernel is not None:
+            return kernel(buf)
+    return _normalize_bytes_py(buf)
+
+
+def prompt_fingerprint(prompt: str, namespace: str = "") -> str:
+    """Hex digest identifying ``prompt`` (after normalization) within ``namespace``."""
+    digest = hashlib.blake2b(namespace.encode(), digest_size=16)
+    digest.update(b"\0")
+    digest.update(normalize_prompt(prompt))
+    return digest.hexdigest()
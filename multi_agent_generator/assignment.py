@@ -0,0 +1,68 @@
+"""
+Keyword assignment of CrewAI tasks to agents.
+
+The model names an agent for each task, but sometimes omits it or names one
+that does not exist. ``assign_agents`` fills those tasks in locally by
+matching the task's wording against the agents' names and roles, so the
+system prompt does not have to spell out the assignment rules.
+"""
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# (task keywords, agent keywords) in priority order; keywords match word
+# prefixes, case-insensitively ("analy" matches "analyze" and "analysis")
+DEFAULT_SKILLS: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...] = (
+    (("research", "investigat", "literature", "search"), ("research",)),
+    (("collect", "gather", "scrap", "fetch", "extract"), ("collector", "data")),
+    (("analy", "statistic", "evaluat", "insight"), ("analyst", "statistician")),
+    (("writ", "draft", "report", "summar", "document"), ("writer", "author")),
+    (("review", "edit", "proofread", "verif", "quality"), ("review", "editor", "quality")),
+    (("coordinat", "plan", "manag", "schedul", "delegat"), ("manager", "coordinator")),
+)
+
+
+def _prefix_pattern(keywords: Sequence[str]):
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + ")", re.IGNORECASE)
+
+
+_COMPILED_SKILLS = tuple(
+    (_prefix_pattern(task_words), _prefix_pattern(agent_words)) for task_words, agent_words in DEFAULT_SKILLS
+)
+
+
+def _match_agent(task: Dict[str, Any], agents: List[Dict[str, Any]]) -> Optional[str]:
+    """Name of the first agent whose name or role fits the task's first matching skill."""
+    text = f"{task.get('name', '')} {task.get('description', '')}"
+    for task_pattern, agent_pattern in _COMPILED_SKILLS:
+        if not task_pattern.search(text):
+            continue
+        for agent in agents:
+            if agent_pattern.search(f"{agent['name']} {agent.get('role', '')}"):
+                return agent["name"]
+    return None
+
+
+def assign_agents(config: Dict[str, Any]) -> None:
+    """
+    Set the ``agent`` of tasks that name no existing agent, in place.
+
+    Tasks no agent's role matches are left unchanged; the code generators
+    assign those to a fallback agent.
+    """
+    agents, tasks = config.get("agents"), config.get("tasks")
+    # Malformed configs are left for schema validation to reject
+    if not isinstance(agents, list) or not isinstance(tasks, list):
+        return
+    agents = [a for a in agents if isinstance(a, dict) and isinstance(a.get("name"), str)]
+    if not agents:
+        return
+    names = {a["name"] for a in agents}
+    for task in tasks:
+        if not isinstance(task, dict):
+            continue
+        agent = task.get("agent")
+        # Models sometimes name the agent with a list or object
+        if not isinstance(agent, str) or agent not in names:
+            name = _match_agent(task, agents)
+            if name is not None:
+                task["agent"] = name
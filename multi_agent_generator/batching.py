@@ -0,0 +1,131 @@
+"""
+Client-side rate limiting and micro-batching of async model requests.
+
+``RequestBatcher`` collects the requests submitted within a short window and
+starts them together as one volley, after taking one token per request from
+an optional ``AsyncTokenBucket``. Concurrent callers (e.g.
+``ModelInference.generate_many``) then stay within the provider's
+requests-per-minute limit instead of running into rate-limit errors.
+``ModelInference`` routes its async calls through a batcher when given one.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional, Set, Tuple, TypeVar
+
+_T = TypeVar("_T")
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket limiting the rate of async operations.
+
+    Tokens refill at ``rate`` per second up to ``burst``. ``acquire`` reserves
+    its tokens immediately and then sleeps until they are earned, so waiting
+    callers are served in order without a lock and the bucket works on any
+    event loop.
+    """
+
+    def __init__(self, rate: float = 100.0, burst: float = 200.0):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Maximum tokens held, i.e. the largest burst let through at once
+
+        Raises:
+            ValueError: If ``rate`` is not positive or ``burst`` is below 1
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` tokens are available and take them."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= tokens
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class RequestBatcher:
+    """Start async requests in volleys of up to ``max_batch``, collected over ``window`` seconds."""
+
+    def __init__(
+        self,
+        max_batch: int = 32,
+        window: float = 0.02,
+        bucket: Optional[AsyncTokenBucket] = None,
+    ):
+        """
+        Args:
+            max_batch: Most requests started in one volley
+            window: Seconds to wait for more requests after the first one arrives
+            bucket: Rate limiter charged one token per request
+        """
+        self.max_batch = max_batch
+        self.window = window
+        self.bucket = bucket
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[Tuple[Callable[[], Awaitable[Any]], asyncio.Future]]"] = None
+        self._collector: Optional["asyncio.Task[None]"] = None
+        # Running volleys, referenced so they are not garbage collected
+        self._volleys: Set["asyncio.Future[Any]"] = set()
+
+    async def submit(self, call: Callable[[], Awaitable[_T]]) -> _T:
+        """Schedule ``call`` in the next volley and return its result."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and tasks belong to one event loop (each asyncio.run makes a new one)
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._volleys = set()
+            self._collector = loop.create_task(self._collect(self._queue))
+        future = loop.create_future()
+        self._queue.put_nowait((call, future))
+        return await future
+
+    async def _collect(self, queue: "asyncio.Queue[Tuple[Callable[[], Awaitable[Any]], asyncio.Future]]") -> None:
+        while True:
+            batch = [await queue.get()]
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            if self.bucket is not None:
+                await self.bucket.acquire(len(batch))
+            volley = asyncio.ensure_future(asyncio.gather(*(self._run(call, future) for call, future in batch)))
+            self._volleys.add(volley)
+            volley.add_done_callback(self._volley_done)
+
+    def _volley_done(self, volley: "asyncio.Future[Any]") -> None:
+        self._volleys.discard(volley)
+        # Errors were handed to the callers; mark them retrieved so asyncio
+        # does not log them again
+        if not volley.cancelled():
+            volley.exception()
+
+    @staticmethod
+    async def _run(call: Callable[[], Awaitable[Any]], future: asyncio.Future) -> None:
+        if future.done():
+            # The caller was cancelled while the request was queued
+            return
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            # Cancel the caller's wait too, instead of leaving it pending forever
+            future.cancel()
+            raise
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        if not future.done():
+            future.set_result(result)
@@ -0,0 +1,86 @@
+"""
+Typed views of the agent, task and tool entries in a generated configuration.
+
+``AgentGenerator.analyze_prompt`` returns plain JSON-compatible dicts. The code
+generators convert each entry once into these frozen, slotted records so the
+emit loops use attribute access instead of repeated dict lookups, and missing
+optional keys get their defaults in one place.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class AgentConfig:
+    """A single agent entry of a configuration."""
+    __slots__ = ("name", "role", "goal", "backstory", "verbose", "allow_delegation", "tools", "llm")
+
+    name: str
+    role: str
+    goal: str
+    backstory: str
+    verbose: bool
+    allow_delegation: bool
+    tools: Tuple[str, ...]
+    llm: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AgentConfig":
+        """Build an AgentConfig from a config dict entry, filling defaults."""
+        return cls(
+            name=data["name"],
+            role=data.get("role", ""),
+            goal=data.get("goal", ""),
+            backstory=data.get("backstory", ""),
+            verbose=data.get("verbose", True),
+            allow_delegation=data.get("allow_delegation", False),
+            tools=tuple(data.get("tools", ())),
+            llm=data.get("llm", "gpt-4.1-mini"),
+        )
+
+
+@dataclass(frozen=True)
+class TaskConfig:
+    """A single task entry of a configuration."""
+    __slots__ = ("name", "description", "agent", "expected_output", "tools")
+
+    name: str
+    description: str
+    agent: Optional[str]
+    expected_output: str
+    tools: Tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskConfig":
+        """Build a TaskConfig from a config dict entry, filling defaults."""
+        return cls(
+            name=data["name"],
+            description=data.get("description", ""),
+            agent=data.get("agent") or None,
+            expected_output=data.get("expected_output", ""),
+            tools=tuple(data.get("tools", ())),
+        )
+
+
+@dataclass(frozen=True)
+class ToolConfig:
+    """A tool entry of a ReAct configuration, with the derived code names."""
+    __slots__ = ("name", "description", "parameters", "class_name", "params_str")
+
+    name: str
+    description: str
+    parameters: Tuple[str, ...]
+    class_name: str
+    params_str: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ToolConfig":
+        """Build a ToolConfig from a config dict entry, deriving class and parameter names."""
+        parameters = tuple(data.get("parameters") or ())
+        return cls(
+            name=data["name"],
+            description=data.get("description", ""),
+            parameters=parameters,
+            class_name=f"{data['name'].capitalize()}Tool",
+            params_str=", ".join(parameters),
+        )
@@ -1,11 +1,79 @@
-from .crewai_generator import create_crewai_code
-from .crewai_flow_generator import create_crewai_flow_code
-from .langgraph_generator import create_langgraph_code
-from .react_generator import create_react_code
+import functools
+import hashlib
+import importlib
+import json
+from typing import Any, Callable, Dict, Optional, TextIO
+
+# Public generator name -> submodule defining it. Submodules are imported on
+# first attribute access (PEP 562) so only the selected framework is loaded.
+_GENERATOR_MODULES = {
+    'create_crewai_code': 'crewai_generator',
+    'create_crewai_flow_code': 'crewai_flow_generator',
+    'create_langgraph_code': 'langgraph_generator',
+    'create_react_code': 'react_generator',
+    'create_react_lcel_code': 'react_generator',
+}
+
+# Generated code keyed by generator name + digest of the canonical config.
+# The generators are pure functions of their config, so repeated calls with
+# an equal config (e.g. re-rendering in the UI) skip code generation.
+_CODE_CACHE_SIZE = 256
+_code_cache: Dict[bytes, str] = {}
+
+
+def _config_key(config: Dict[str, Any]) -> bytes:
+    canonical = json.dumps(config, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(canonical, digest_size=16).digest()
+
+
+def _memoize(generate: Callable[..., Optional[str]]) -> Callable[..., Optional[str]]:
+    prefix = generate.__name__.encode()
+
+    @functools.wraps(generate)
+    def wrapper(config: Dict[str, Any], out: Optional[TextIO] = None) -> Optional[str]:
+        key = prefix + _config_key(config)
+        code = _code_cache.get(key)
+        if code is None:
+            if out is not None:
+                # Stream a fresh generation straight to ``out``
+                return generate(config, out)
+            code = generate(config)
+            if len(_code_cache) >= _CODE_CACHE_SIZE:
+                # Evict the oldest entry (dicts preserve insertion order)
+                _code_cache.pop(next(iter(_code_cache)))
+            _code_cache[key] = code
+        if out is not None:
+            out.write(code)
+            return None
+        return code
+
+    return wrapper
+
+
+def clear_code_cache() -> None:
+    """Drop all memoized generated code."""
+    _code_cache.clear()
+
+
+def __getattr__(name: str) -> Callable[..., Optional[str]]:
+    module_name = _GENERATOR_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    generate = _memoize(getattr(module, name))
+    globals()[name] = generate
+    return generate
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_GENERATOR_MODULES))
+
 
 __all__ = [
     'create_crewai_code',
     'create_crewai_flow_code',
     'create_langgraph_code',
     'create_react_code',
-]
\ No newline at end of file
+    'create_react_lcel_code',
+    'clear_code_cache',
+]
@@ -2,9 +2,114 @@
 """
 Generator for CrewAI Flow code.
 """
-from typing import Dict, Any
+from typing import Any, Dict, Optional, TextIO
 
-def create_crewai_flow_code(config: Dict[str, Any]) -> str:
+from ..config import AgentConfig, TaskConfig
+
+# Skeleton of the generated module, filled with a single format_map call.
+# Literal braces in the generated code are doubled.
+_MODULE_TPL = """from crewai import Agent, Task, Crew
+from crewai.flow.flow import Flow, listen, start
+from typing import Dict, List, Any
+from pydantic import BaseModel, Field
+
+# Define flow state
+class AgentState(BaseModel):
+    query: str = Field(default="")
+    results: Dict[str, Any] = Field(default_factory=dict)
+    current_step: str = Field(default="")
+
+{agents_block}{tasks_block}# Crew Configuration
+crew = Crew(
+    agents=[{crew_agents}],
+    tasks=[{crew_tasks}],
+    verbose=True
+)
+
+# Define CrewAI Flow
+class WorkflowFlow(Flow[AgentState]):
+    @start()
+    def initial_input(self):
+        \"\"\"Process the initial user query.\"\"\"
+        print("Starting workflow...")
+        self.state.current_step = "{first_task}"
+        return self.state
+
+{steps_block}    @listen('{last_step}')
+    def aggregate_results(self, state):
+        \"\"\"Combine all results from tasks.\"\"\"
+        print("Workflow completed, aggregating results...")
+        
+        # Combine all results
+        combined_result = ""
+        for task_name, result in state.results.items():
+            combined_result += f"\\n\\n=== {{task_name}} ===\\n{{result}}"
+        
+        return combined_result
+
+# Run the flow
+def run_workflow(query: str):
+    flow = WorkflowFlow()
+    flow.state.query = query
+    result = flow.kickoff()
+    return result
+
+# Generate a visualization of the flow
+def visualize_flow():
+    flow = WorkflowFlow()
+    flow.plot("workflow_flow")
+    print("Flow visualization saved to workflow_flow.html")
+
+# Example usage
+if __name__ == "__main__":
+    result = run_workflow("Your query here")
+    print(result)
+"""
+
+_AGENT_TPL = """# Agent: {name}
+agent_{name} = Agent(
+    role={role},
+    goal={goal},
+    backstory={backstory},
+    verbose={verbose},
+    allow_delegation={allow_delegation},
+    tools={tools}
+)
+
+"""
+
+_TASK_TPL = """# Task: {name}
+task_{name} = Task(
+    description={description},
+    agent=agent_{agent},
+    expected_output={expected_output}
+)
+
+"""
+
+# One @listen step per task, chained from the previous step
+_STEP_TPL = """    @listen('{previous_step}')
+    def execute_{method}(self, state):
+        \"\"\"Execute the {name} task.\"\"\"
+        print(f"Executing task: {name}")
+        
+        # Run the specific task with the crew
+        result = crew.kickoff(
+            tasks=[task_{name}],
+            inputs={{
+                "query": self.state.query,
+                "previous_results": self.state.results
+            }}
+        )
+        
+        # Store results in state
+        self.state.results["{name}"] = result
+        self.state.current_step = "{next_task}"
+        return self.state
+
+"""
+
+def create_crewai_flow_code(config: Dict[str, Any], out: Optional[TextIO] = None) -> Optional[str]:
     """
     Generate CrewAI Flow code from a configuration.
     
@@ -13,130 +118,68 @@ def create_crewai_flow_code(config: Dict[str, Any]) -> str:
     
     Args:
         config: Dictionary containing agents, tasks, and workflow configuration
+        out: Optional text stream to write the code to instead of returning it
         
     Returns:
-        Generated Python code as a string
+        Generated Python code as a string, or None when written to ``out``
     """
-    # Start with the basic imports
-    code = "from crewai import Agent, Task, Crew\n"
-    code += "from crewai.flow.flow import Flow, listen, start\n"
-    code += "from typing import Dict, List, Any\n"
-    code += "from pydantic import BaseModel, Field\n\n"
-    
-    # Define state model for the flow
-    code += "# Define flow state\n"
-    code += "class AgentState(BaseModel):\n"
-    code += "    query: str = Field(default=\"\")\n"
-    code += "    results: Dict[str, Any] = Field(default_factory=dict)\n"
-    code += "    current_step: str = Field(default=\"\")\n\n"
-    
+    agents = [AgentConfig.from_dict(a) for a in config["agents"]]
+    tasks = [TaskConfig.from_dict(t) for t in config["tasks"]]
+
+    # Tasks without an agent are assigned to the first agent
+    default_agent = agents[0].name if agents else None
+
     # Generate Agent configurations
-    for agent in config["agents"]:
-        code += f"# Agent: {agent['name']}\n"
-        code += f"agent_{agent['name']} = Agent(\n"
-        code += f"    role='{agent['role']}',\n"
-        code += f"    goal='{agent['goal']}',\n"
-        code += f"    backstory='{agent['backstory']}',\n"
-        code += f"    verbose={agent['verbose']},\n"
-        code += f"    allow_delegation={agent['allow_delegation']},\n"
-        code += f"    tools={agent['tools']}\n"
-        code += ")\n\n"
+    agents_block = "".join(
+        _AGENT_TPL.format(
+            name=agent.name,
+            role=repr(agent.role),
+            goal=repr(agent.goal),
+            backstory=repr(agent.backstory),
+            verbose=agent.verbose,
+            allow_delegation=agent.allow_delegation,
+            tools=list(agent.tools),
+        )
+        for agent in agents
+    )
 
     # Generate Task configurations
-    for task in config["tasks"]:
-        code += f"# Task: {task['name']}\n"
-        code += f"task_{task['name']} = Task(\n"
-        code += f"    description='{task['description']}',\n"
-        code += f"    agent=agent_{task['agent']},\n"
-        code += f"    expected_output='{task['expected_output']}'\n"
-        code += ")\n\n"
-
-    # Generate Crew configuration
-    code += "# Crew Configuration\n"
-    code += "crew = Crew(\n"
-    code += "    agents=[" + ", ".join(f"agent_{a['name']}" for a in config["agents"]) + "],\n"
-    code += "    tasks=[" + ", ".join(f"task_{t['name']}" for t in config["tasks"]) + "],\n"
-    code += "    verbose=True\n"
-    code += ")\n\n"
-    
-    # Create Flow class
-    code += "# Define CrewAI Flow\n"
-    code += "class WorkflowFlow(Flow[AgentState]):\n"
-    
-    # Define initial step with @start decorator
-    code += "    @start()\n"
-    code += "    def initial_input(self):\n"
-    code += "        \"\"\"Process the initial user query.\"\"\"\n"
-    code += "        print(\"Starting workflow...\")\n"
-    
-    # Set the first task as the current step
-    first_task = config["tasks"][0]["name"] if config["tasks"] else "completed"
-    code += f"        self.state.current_step = \"{first_task}\"\n"
-    code += "        return self.state\n\n"
-    
+    tasks_block = "".join(
+        _TASK_TPL.format(
+            name=task.name,
+            description=repr(task.description),
+            agent=task.agent or default_agent,
+            expected_output=repr(task.expected_output),
+        )
+        for task in tasks
+    )
+
     # Add task steps with @listen decorators
-    tasks = config["tasks"]
+    steps = []
     previous_step = "initial_input"
-    
+
     for i, task in enumerate(tasks):
-        task_name = task["name"].replace("-", "_")
-        code += f"    @listen('{previous_step}')\n"
-        code += f"    def execute_{task_name}(self, state):\n"
-        code += f"        \"\"\"Execute the {task['name']} task.\"\"\"\n"
-        code += f"        print(f\"Executing task: {task['name']}\")\n"
-        code += "        \n"
-        code += f"        # Run the specific task with the crew\n"
-        code += f"        result = crew.kickoff(\n"
-        code += f"            tasks=[task_{task['name']}],\n"
-        code += f"            inputs={{\n"
-        code += f"                \"query\": self.state.query,\n"
-        code += f"                \"previous_results\": self.state.results\n"
-        code += f"            }}\n"
-        code += f"        )\n"
-        code += f"        \n"
-        code += f"        # Store results in state\n"
-        code += f"        self.state.results[\"{task['name']}\"] = result\n"
-        
-        if i < len(tasks) - 1:
-            next_task = tasks[i+1]["name"]
-            code += f"        self.state.current_step = \"{next_task}\"\n"
-        else:
-            code += f"        self.state.current_step = \"completed\"\n"
-            
-        code += f"        return self.state\n\n"
+        task_name = task.name.replace("-", "_")
+        steps.append(_STEP_TPL.format(
+            previous_step=previous_step,
+            method=task_name,
+            name=task.name,
+            next_task=tasks[i+1].name if i < len(tasks) - 1 else "completed",
+        ))
         previous_step = f"execute_{task_name}"
-    
-    # Add final aggregation step
-    code += f"    @listen('{previous_step}')\n"
-    code += f"    def aggregate_results(self, state):\n"
-    code += f"        \"\"\"Combine all results from tasks.\"\"\"\n"
-    code += f"        print(\"Workflow completed, aggregating results...\")\n"
-    code += f"        \n"
-    code += f"        # Combine all results\n"
-    code += f"        combined_result = \"\"\n"
-    code += f"        for task_name, result in state.results.items():\n"
-    code += f"            combined_result += f\"\\n\\n=== {task_name} ===\\n{{result}}\"\n"
-    code += f"        \n"
-    code += f"        return combined_result\n\n"
-    
-    # Add execution code
-    code += "# Run the flow\n"
-    code += "def run_workflow(query: str):\n"
-    code += "    flow = WorkflowFlow()\n"
-    code += "    flow.state.query = query\n"
-    code += "    result = flow.kickoff()\n"
-    code += "    return result\n\n"
-    
-    # Visualization function
-    code += "# Generate a visualization of the flow\n"
-    code += "def visualize_flow():\n"
-    code += "    flow = WorkflowFlow()\n"
-    code += "    flow.plot(\"workflow_flow\")\n"
-    code += "    print(\"Flow visualization saved to workflow_flow.html\")\n\n"
-    
-    code += "# Example usage\n"
-    code += "if __name__ == \"__main__\":\n"
-    code += "    result = run_workflow(\"Your query here\")\n"
-    code += "    print(result)\n"
-    
-    return code
\ No newline at end of file
+
+    # The first task becomes the current step; the final aggregation step
+    # listens to the last task step
+    code = _MODULE_TPL.format_map({
+        "agents_block": agents_block,
+        "tasks_block": tasks_block,
+        "crew_agents": ", ".join(f"agent_{a.name}" for a in agents),
+        "crew_tasks": ", ".join(f"task_{t.name}" for t in tasks),
+        "first_task": tasks[0].name if tasks else "completed",
+        "steps_block": "".join(steps),
+        "last_step": previous_step,
+    })
+    if out is None:
+        return code
+    out.write(code)
+    return None
@@ -1,119 +1,157 @@
-from crewai import Agent as CrewAgent, Task as CrewTask, Crew, Process
-from typing import List, Dict, Any, Optional
-import os
-import json
-import time
+import functools
+from typing import Any, Dict, Optional, TextIO
 
+from ..config import AgentConfig, TaskConfig
+
+# Skeleton of the generated module, filled with a single format_map call.
+# Literal braces in the generated code are doubled.
+_MODULE_TPL = """from crewai import Agent, Task, Crew, Process
+{flow_import}from typing import Dict, List, Any
+from pydantic import BaseModel, Field
+
+{state_model}{agents_block}{tasks_block}# Crew Configuration
+crew = Crew(
+    agents=[{crew_agents}],
+    tasks=[{crew_tasks}],
+{process_lines}    verbose=True
+)
+
+# Run the workflow
+def run_workflow(query: str):
+    \"\"\"Run workflow using CrewAI.\"\"\"
+    result = crew.kickoff(
+        inputs={{
+            "query": query
+        }}
+    )
+    return result
+
+# Example usage
+if __name__ == "__main__":
+    result = run_workflow("Your query here")
+    print(result)
+"""
+
+_FLOW_IMPORT = "from crewai.flow.flow import Flow, listen, start\n"
+
+_STATE_MODEL = """# Define flow state
+class AgentState(BaseModel):
+    query: str = Field(default="")
+    results: Dict[str, Any] = Field(default_factory=dict)
+    current_step: str = Field(default="")
+
+"""
+
+_AGENT_TPL = """# Agent: {name}
+{var} = Agent(
+    role={role},
+    goal={goal},
+    backstory={backstory},
+    verbose={verbose},
+    allow_delegation={allow_delegation},
+    tools={tools}{limits})
+
+"""
+
+_MANAGER_LIMITS = ",\n    max_iter=5,\n    max_execution_time=300\n"
+
+_TASK_TPL = """# Task: {name}
+{var} = Task(
+    description={description},
+{agent_line}    expected_output={expected_output}
+)
+
+"""
+
+_AGENT_LINE_TPL = "    agent={var},\n"
+
+_FALLBACK_AGENT_LINE_TPL = "    # Auto-assigned to: {name}\n    agent={var},\n"
+
+_HIERARCHICAL_TPL = "    process=Process.hierarchical,\n    manager_agent={manager},\n"
+
+_SEQUENTIAL_LINES = "    process=Process.sequential,\n"
+
+# Spaces/hyphens become underscores, quotes are dropped
+_VAR_NAME_TABLE = str.maketrans({" ": "_", "-": "_", "'": None, '"': None})
+
+@functools.lru_cache(maxsize=1024)
 def _sanitize_var_name(name: str) -> str:
     """Convert agent/task name to a valid Python variable name."""
-    return name.strip().lower().replace(" ", "_").replace("-", "_").replace("'", "").replace('"', "")
+    return name.strip().lower().translate(_VAR_NAME_TABLE)
 
-def create_crewai_code(config: Dict[str, Any]) -> str:
+def create_crewai_code(config: Dict[str, Any], out: Optional[TextIO] = None) -> Optional[str]:
+    # With ``out`` the code is written there and None is returned
     # Get process type from config (default to sequential)
     process_type = config.get("process", "sequential").lower()
-    
-    # Start with the basic imports plus Flow imports
-    code = "from crewai import Agent, Task, Crew, Process\n"
-    if process_type == "sequential":
-        code += "from crewai.flow.flow import Flow, listen, start\n"
-    code += "from typing import Dict, List, Any\n"
-    code += "from pydantic import BaseModel, Field\n\n"
-    
-    if process_type == "sequential":
-        # Define state model for the flow (only for sequential)
-        code += "# Define flow state\n"
-        code += "class AgentState(BaseModel):\n"
-        code += "    query: str = Field(default=\"\")\n"
-        code += "    results: Dict[str, Any] = Field(default_factory=dict)\n"
-        code += "    current_step: str = Field(default=\"\")\n\n"
-    
+
+    agents = [AgentConfig.from_dict(a) for a in config["agents"]]
+    tasks = [TaskConfig.from_dict(t) for t in config["tasks"]]
+    is_hierarchical = process_type == "hierarchical"
+
     # Create a mapping of agent names to sanitized variable names
-    agent_name_to_var = {}
-    
+    agent_name_to_var = {a.name: f"agent_{_sanitize_var_name(a.name)}" for a in agents}
+
     # Generate Agent configurations
-    for i, agent in enumerate(config["agents"]):
-        agent_var = f"agent_{_sanitize_var_name(agent['name'])}"
-        agent_name_to_var[agent['name']] = agent_var
-        
-        code += f"# Agent: {agent['name']}\n"
-        code += f"{agent_var} = Agent(\n"
-        code += f"    role={agent['role']!r},\n"
-        code += f"    goal={agent['goal']!r},\n"
-        code += f"    backstory={agent['backstory']!r},\n"
-        code += f"    verbose={agent['verbose']},\n"
-        code += f"    allow_delegation={agent['allow_delegation']},\n"
-        code += f"    tools={agent['tools']}"
-        
-        # For hierarchical process, mark the first agent as manager
-        if process_type == "hierarchical" and i == 0:
-            code += ",\n    max_iter=5,\n"
-            code += "    max_execution_time=300\n"
-        else:
-            code += "\n"
-        
-        code += ")\n\n"
+    # (for hierarchical process, the first agent is marked as manager)
+    agents_block = "".join(
+        _AGENT_TPL.format(
+            name=agent.name,
+            var=agent_name_to_var[agent.name],
+            role=repr(agent.role),
+            goal=repr(agent.goal),
+            backstory=repr(agent.backstory),
+            verbose=agent.verbose,
+            allow_delegation=agent.allow_delegation,
+            tools=list(agent.tools),
+            limits=_MANAGER_LIMITS if is_hierarchical and i == 0 else "\n",
+        )
+        for i, agent in enumerate(agents)
+    )
+
+    # Always assign agents to tasks, even in hierarchical mode. If no agent is
+    # specified or it is not found, assign to the first non-manager agent
+    # (hierarchical) or to the first agent (sequential)
+    agent_lines = {name: _AGENT_LINE_TPL.format(var=var) for name, var in agent_name_to_var.items()}
+    fallback_line = ""
+    if agents:
+        fallback_agent = agents[1].name if is_hierarchical and len(agents) > 1 else agents[0].name
+        fallback_line = _FALLBACK_AGENT_LINE_TPL.format(
+            name=fallback_agent, var=agent_name_to_var[fallback_agent]
+        )
 
     # Generate Task configurations
-    for task in config["tasks"]:
-        task_var = f"task_{_sanitize_var_name(task['name'])}"
-        code += f"# Task: {task['name']}\n"
-        code += f"{task_var} = Task(\n"
-        code += f"    description={task['description']!r},\n"
-        
-        # Always assign agents to tasks, even in hierarchical mode
-        agent_name = task.get('agent')
-        if agent_name and agent_name in agent_name_to_var:
-            agent_var = agent_name_to_var[agent_name]
-            code += f"    agent={agent_var},\n"
-        else:
-            # If no agent specified or agent not found, find the most suitable one
-            # or assign to the first non-manager agent (for hierarchical)
-            if process_type == "hierarchical" and len(config["agents"]) > 1:
-                # Assign to first worker agent (not the manager)
-                fallback_agent = config["agents"][1]["name"]
-            else:
-                # For sequential, assign to first agent
-                fallback_agent = config["agents"][0]["name"]
-            
-            fallback_var = agent_name_to_var[fallback_agent]
-            code += f"    # Auto-assigned to: {fallback_agent}\n"
-            code += f"    agent={fallback_var},\n"
-        
-        code += f"    expected_output={task['expected_output']!r}\n"
-        code += ")\n\n"
+    task_vars = [f"task_{_sanitize_var_name(task.name)}" for task in tasks]
+    tasks_block = "".join(
+        _TASK_TPL.format(
+            name=task.name,
+            var=var,
+            description=repr(task.description),
+            agent_line=agent_lines.get(task.agent, fallback_line),
+            expected_output=repr(task.expected_output),
+        )
+        for task, var in zip(tasks, task_vars)
+    )
 
     # Generate Crew configuration
-    code += "# Crew Configuration\n"
-    code += "crew = Crew(\n"
-    code += "    agents=[" + ", ".join(agent_name_to_var.values()) + "],\n"
-    code += "    tasks=[" + ", ".join(f"task_{_sanitize_var_name(t['name'])}" for t in config["tasks"]) + "],\n"
-    
-    # Set process type
-    if process_type == "hierarchical":
-        code += "    process=Process.hierarchical,\n"
+    if is_hierarchical:
         # The first agent becomes the manager
         manager_var = list(agent_name_to_var.values())[0]
-        code += f"    manager_agent={manager_var},\n"
+        process_lines = _HIERARCHICAL_TPL.format(manager=manager_var)
     else:
-        code += "    process=Process.sequential,\n"
-    
-    code += "    verbose=True\n"
-    code += ")\n\n"
-    
-    # Run the workflow (up to kickoff) for both process types
-    code += "# Run the workflow\n"
-    code += "def run_workflow(query: str):\n"
-    code += "    \"\"\"Run workflow using CrewAI.\"\"\"\n"
-    code += "    result = crew.kickoff(\n"
-    code += "        inputs={\n"
-    code += "            \"query\": query\n"
-    code += "        }\n"
-    code += "    )\n"
-    code += "    return result\n\n"
-    
-    # Example usage
-    code += "# Example usage\n"
-    code += "if __name__ == \"__main__\":\n"
-    code += "    result = run_workflow(\"Your query here\")\n"
-    code += "    print(result)\n"
-    return code 
+        process_lines = _SEQUENTIAL_LINES
+
+    # Flow imports and the state model are only used for sequential
+    sequential = process_type == "sequential"
+    code = _MODULE_TPL.format_map({
+        "flow_import": _FLOW_IMPORT if sequential else "",
+        "state_model": _STATE_MODEL if sequential else "",
+        "agents_block": agents_block,
+        "tasks_block": tasks_block,
+        "crew_agents": ", ".join(agent_name_to_var.values()),
+        "crew_tasks": ", ".join(task_vars),
+        "process_lines": process_lines,
+    })
+    if out is None:
+        return code
+    out.write(code)
+    return None
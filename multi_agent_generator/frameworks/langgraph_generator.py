@@ -1,14 +1,9 @@
-from typing import List, Dict, Any, Optional
-from langgraph.graph import StateGraph, END
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
-from langchain_core.agents import AgentFinish, AgentAction
-from langchain_core.tools import BaseTool
+import functools
 import json
+from typing import Any, Dict, FrozenSet, Optional, TextIO
 
-def create_langgraph_code(config: Dict[str, Any]) -> str:
-    code = """from langgraph.graph import StateGraph, END
+# Static parts of the generated module, built once at import
+_HEADER = """from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import BaseTool
@@ -21,81 +16,55 @@ class AgentState(TypedDict):
     next: str
 
 """
-    
-    # Generate tool definitions if needed
-    if any(agent["tools"] for agent in config["agents"]):
-        code += "# Define tools\n"
-        tools = set()
-        for agent in config["agents"]:
-            tools.update(agent["tools"])
-        
-        for tool in tools:
-            code += f"""class {tool.capitalize()}Tool(BaseTool):
-    name = "{tool}"
-    description = "Tool for {tool} operations"
-    
-    def _run(self, query: str) -> str:
-        # Implement actual functionality here
-        return f"Result from {tool} tool: {{query}}"
-    
-    async def _arun(self, query: str) -> str:
-        # Implement actual functionality here
-        return f"Result from {tool} tool: {{query}}"
 
-"""
-        
-        code += "tools = [\n"
-        for tool in tools:
-            code += f"    {tool.capitalize()}Tool(),\n"
-        code += "]\n\n"
-    
-    # Generate Agent configurations
-    for agent in config["agents"]:
-        code += f"# Agent: {agent['name']}\n"
-        code += f"def {agent['name']}_agent(state: AgentState) -> AgentState:\n"
-        code += f"    \"\"\"Agent that handles {agent['role']}.\"\"\"\n"
-        code += f"    # Create LLM\n"
-        code += f"    llm = ChatOpenAI(model=\"{agent['llm']}\")\n"
-        code += f"    # Get the most recent message\n"
-        code += f"    messages = state['messages']\n"
-        code += f"    response = llm.invoke(messages)\n"
-        code += f"    # Add the response to the messages\n"
-        code += f"    return {{\n"
-        code += f"        \"messages\": messages + [response],\n"
-        code += f"        \"next\": state.get(\"next\", \"\")\n"
-        code += f"    }}\n\n"
-    
-    # Define routing logic function
-    code += """# Define routing logic
+_ROUTER = """# Define routing logic
 def router(state: AgentState) -> str:
     \"\"\"Route to the next node.\"\"\"
     return state.get("next", "END")
 
 """
-    
-    # Generate graph configuration
-    code += "# Define the graph\n"
-    code += "workflow = StateGraph(AgentState)\n\n"
-    
-    # Add nodes
-    code += "# Add nodes to the graph\n"
-    for node in config["nodes"]:
-        code += f"workflow.add_node(\"{node['name']}\", {node['agent']}_agent)\n"
-    
-    code += "\n# Add conditional edges\n"
-    # Add edges
-    for edge in config["edges"]:
-        if edge["target"] == "END":
-            code += f"workflow.add_edge(\"{edge['source']}\", END)\n"
-        else:
-            code += f"workflow.add_edge(\"{edge['source']}\", \"{edge['target']}\")\n"
-    
-    # Set entry point
-    if config["nodes"]:
-        code += f"\n# Set entry point\nworkflow.set_entry_point(\"{config['nodes'][0]['name']}\")\n"
-    
-    # Compile and run
-    code += """
+
+_GRAPH_START = (
+    "# Define the graph\n"
+    "workflow = StateGraph(AgentState)\n\n"
+    "# Add nodes to the graph\n"
+)
+
+_TOOL_TPL = (
+    "class {cap}Tool(BaseTool):\n"
+    "    name = \"{name}\"\n"
+    "    description = \"Tool for {name} operations\"\n"
+    "    \n"
+    "    def _run(self, query: str) -> str:\n"
+    "        # Implement actual functionality here\n"
+    "        return f\"Result from {name} tool: {{query}}\"\n"
+    "    \n"
+    "    async def _arun(self, query: str) -> str:\n"
+    "        # Implement actual functionality here\n"
+    "        return f\"Result from {name} tool: {{query}}\"\n\n"
+)
+
+_AGENT_TPL = (
+    "# Agent: {name}\n"
+    "def {name}_agent(state: AgentState) -> AgentState:\n"
+    "    \"\"\"Agent that handles {role}.\"\"\"\n"
+    "    # Create LLM\n"
+    "    llm = ChatOpenAI(model={llm})\n"
+    "    # Get the most recent message\n"
+    "    messages = state['messages']\n"
+    "    response = llm.invoke(messages)\n"
+    "    # Add the response to the messages\n"
+    "    return {{\n"
+    "        \"messages\": messages + [response],\n"
+    "        \"next\": state.get(\"next\", \"\")\n"
+    "    }}\n\n"
+)
+
+_NODE_TPL = "workflow.add_node(\"{name}\", {agent}_agent)\n"
+_EDGE_TPL = "workflow.add_edge(\"{source}\", \"{target}\")\n"
+_END_EDGE_TPL = "workflow.add_edge(\"{source}\", END)\n"
+
+_FOOTER = """
 # Compile the graph
 app = workflow.compile()
 
@@ -114,7 +83,57 @@ if __name__ == "__main__":
     for message in result:
         print(f"{message.type}: {message.content}")
 """
+
+@functools.lru_cache(maxsize=128)
+def _tool_section(tools: FrozenSet[str]) -> str:
+    """Render the tool classes and ``tools`` list (sorted so output is deterministic)."""
+    caps = [(tool, tool.capitalize()) for tool in sorted(tools)]
+    return (
+        "# Define tools\n"
+        + "".join(_TOOL_TPL.format(name=name, cap=cap) for name, cap in caps)
+        + "tools = [\n" + "".join(f"    {cap}Tool(),\n" for _, cap in caps) + "]\n\n"
+    )
+
+def create_langgraph_code(config: Dict[str, Any], out: Optional[TextIO] = None) -> Optional[str]:
+    parts = [_HEADER]
+    
+    # Generate tool definitions if needed
+    tools = frozenset().union(*(agent["tools"] for agent in config["agents"]))
+    if tools:
+        parts.append(_tool_section(tools))
+    
+    # Generate Agent configurations
+    parts.append("".join(
+        _AGENT_TPL.format(name=agent['name'], role=agent['role'], llm=json.dumps(agent['llm']))
+        for agent in config["agents"]
+    ))
+    
+    # Define routing logic function
+    parts.append(_ROUTER)
+    
+    # Generate graph configuration
+    parts.append(_GRAPH_START)
+    
+    # Add nodes
+    parts.append("".join(_NODE_TPL.format(**node) for node in config["nodes"]))
+    
+    parts.append("\n# Add conditional edges\n")
+    # Add edges
+    parts.append("".join(
+        _END_EDGE_TPL.format(**edge) if edge["target"] == "END" else _EDGE_TPL.format(**edge)
+        for edge in config["edges"]
+    ))
+    
+    # Set entry point
+    if config["nodes"]:
+        parts.append(f"\n# Set entry point\nworkflow.set_entry_point(\"{config['nodes'][0]['name']}\")\n")
+    
+    # Compile and run
+    parts.append(_FOOTER)
     
     # Now wrap the generated code in JSON format
-    # return json.dumps({"generated_code": code}, indent=4)
-    return code
+    # return json.dumps({"generated_code": "".join(parts)}, indent=4)
+    if out is None:
+        return "".join(parts)
+    out.writelines(parts)
+    return None
@@ -1,61 +1,49 @@
-from typing import Dict, Any, List
-from langchain_core.tools import BaseTool
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.output_parsers import StrOutputParser
-from langchain_openai import ChatOpenAI
-from langchain.agents import create_react_agent, AgentExecutor
+import json
+from typing import Dict, Any, Optional, TextIO
 
+from ..config import ToolConfig
 
-# ---------------------------
-# Classic ReAct (AgentExecutor)
-# ---------------------------
-def create_react_code(config: Dict[str, Any]) -> str:
-    code = """from langchain_core.tools import BaseTool
+__all__ = ["create_react_code", "create_react_lcel_code"]
+
+# Module skeletons and blocks, each filled with one format_map call.
+# Literal braces in the generated code are doubled.
+_CLASSIC_MODULE_TPL = """from langchain_core.tools import BaseTool
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from langchain.agents import create_react_agent, AgentExecutor
 from typing import Dict, List, Any
 
-"""
+{tools_section}{agent_block}"""
 
-    # Define tools
-    code += "# Define tools\n"
-    for tool in config.get("tools", []):
-        params = ", ".join(tool.get("parameters", {}).keys()) if tool.get("parameters") else ""
-        param_names = ", ".join(tool.get("parameters", {}).keys()) if tool.get("parameters") else ""
-        class_name = f"{tool['name'].capitalize()}Tool"
-        # Use double braces for literal {self.name} and {locals()} inside the generated code
-        code += f"""class {class_name}(BaseTool):
-    name = "{tool['name']}"
-    description = "{tool['description']}"
+_LCEL_MODULE_TPL = """from typing import Dict, Any, List, Optional
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnablePassthrough
+from langchain_openai import ChatOpenAI
+from langchain_core.tools import BaseTool
+
+{tools_section}{agent_block}"""
+
+_TOOL_CLASS_TPL = """class {class_name}(BaseTool):
+    name = {name}
+    description = {description}
     
-    def _run(self{', ' if params else ''}{params}) -> str:
+    def _run(self{run_params}) -> str:
         try:
-            # TODO: implement actual functionality
+            # TODO: {todo}
             return f"Executed {{self.name}} with inputs: {{locals()}}"
         except Exception as e:
             return f"Error in {{self.name}}: {{str(e)}}"
     
-    async def _arun(self{', ' if params else ''}{params}) -> str:
-        return self._run({param_names})
+    async def _arun(self{run_params}) -> str:
+        return self._run({params})
 
 """
 
-    # Collect tools
-    code += "tools = [\n"
-    for tool in config.get("tools", []):
-        code += f"    {tool['name'].capitalize()}Tool(),\n"
-    code += "]\n\n"
-
-    # Agent setup
-    if config.get("agents"):
-        agent = config["agents"][0]
-        # safe fallback for missing llm field
-        llm_model = agent.get("llm", "gpt-4.1-mini")
-        code += f"""llm = ChatOpenAI(model="{llm_model}")
+_CLASSIC_AGENT_TPL = """llm = ChatOpenAI(model={llm})
 
 react_prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are {agent['role']}. Your goal is {agent['goal']}. Use tools when needed."),
+    ("system", {system_prompt}),
     ("human", "{{input}}")
 ])
 
@@ -79,56 +67,11 @@ if __name__ == "__main__":
     result = run_agent("Your query here")
     print(result)
 """
-    return code
-
-# ---------------------------
-# LCEL-based ReAct (future-proof)
-# ---------------------------
-def create_react_lcel_code(config: Dict[str, Any]) -> str:
-    code = """from typing import Dict, Any, List
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
-from langchain_openai import ChatOpenAI
-from langchain_core.tools import BaseTool
-
-"""
-
-    # Define tools
-    code += "# Define tools\n"
-    for tool in config.get("tools", []):
-        params = ", ".join(tool.get("parameters", {}).keys()) if tool.get("parameters") else ""
-        param_names = ", ".join(tool.get("parameters", {}).keys()) if tool.get("parameters") else ""
-        class_name = f"{tool['name'].capitalize()}Tool"
-        code += f"""class {class_name}(BaseTool):
-    name = "{tool['name']}"
-    description = "{tool['description']}"
-    
-    def _run(self{', ' if params else ''}{params}) -> str:
-        try:
-            # TODO: implement actual logic for the tool
-            return f"Executed {{self.name}} with inputs: {{locals()}}"
-        except Exception as e:
-            return f"Error in {{self.name}}: {{str(e)}}"
-    
-    async def _arun(self{', ' if params else ''}{params}) -> str:
-        return self._run({param_names})
-
-"""
-
-    # Collect tools
-    code += "tools = [\n"
-    for tool in config.get("tools", []):
-        code += f"    {tool['name'].capitalize()}Tool(),\n"
-    code += "]\n\n"
 
-    if config.get("agents"):
-        agent = config["agents"][0]
-        llm_model = agent.get("llm", "gpt-4.1-mini")
-        code += f"""llm = ChatOpenAI(model="{llm_model}")
+_LCEL_AGENT_TPL = """llm = ChatOpenAI(model={llm})
 
 react_prompt = ChatPromptTemplate.from_messages([
-    ("system", "You are {agent['role']}. Your goal is {agent['goal']}. Use tools when needed."),
+    ("system", {system_prompt}),
     MessagesPlaceholder("history"),
     ("human", "{{input}}")
 ])
@@ -140,7 +83,8 @@ chain = (
     | StrOutputParser()
 )
 
-def run_agent(query: str, history: List[str] = []) -> str:
+def run_agent(query: str, history: Optional[List[str]] = None) -> str:
+    history = history or []
     response = chain.invoke({{"input": query, "history": history}})
     # If the config included examples with thoughts/actions/observations, print them for debugging
     try:
@@ -154,4 +98,66 @@ if __name__ == "__main__":
     result = run_agent("Your query here")
     print(result)
 """
-    return code
+
+
+def _system_prompt_literal(agent: Dict[str, Any]) -> str:
+    """Python literal for the agent's system prompt, safe for ChatPromptTemplate."""
+    text = f"You are {agent['role']}. Your goal is {agent['goal']}. Use tools when needed."
+    # Braces would otherwise be read as template variables
+    return json.dumps(text.replace("{", "{{").replace("}", "}}"))
+
+
+def _tools_section(config: Dict[str, Any], todo: str) -> str:
+    """Emit the BaseTool subclasses for the config's tools and the ``tools`` list."""
+    tools = [ToolConfig.from_dict(tool) for tool in config.get("tools", [])]
+    classes = "".join(
+        _TOOL_CLASS_TPL.format_map({
+            "class_name": tool.class_name,
+            "name": json.dumps(tool.name),
+            "description": json.dumps(tool.description),
+            "run_params": f", {tool.params_str}" if tool.params_str else "",
+            "params": tool.params_str,
+            "todo": todo,
+        })
+        for tool in tools
+    )
+    tools_list = "".join(f"    {tool.class_name}(),\n" for tool in tools)
+    return f"# Define tools\n{classes}tools = [\n{tools_list}]\n\n"
+
+
+def _agent_block(config: Dict[str, Any], template: str) -> str:
+    """Emit the LLM/prompt/agent setup for the first agent, if any."""
+    if not config.get("agents"):
+        return ""
+    agent = config["agents"][0]
+    return template.format_map({
+        # safe fallback for missing llm field
+        "llm": json.dumps(agent.get("llm", "gpt-4.1-mini")),
+        "system_prompt": _system_prompt_literal(agent),
+    })
+
+
+def _emit(code: str, out: Optional[TextIO]) -> Optional[str]:
+    if out is None:
+        return code
+    out.write(code)
+    return None
+
+
+# ---------------------------
+# Classic ReAct (AgentExecutor)
+# ---------------------------
+def create_react_code(config: Dict[str, Any], out: Optional[TextIO] = None) -> Optional[str]:
+    return _emit(_CLASSIC_MODULE_TPL.format_map({
+        "tools_section": _tools_section(config, "implement actual functionality"),
+        "agent_block": _agent_block(config, _CLASSIC_AGENT_TPL),
+    }), out)
+
+# ---------------------------
+# LCEL-based ReAct (future-proof)
+# ---------------------------
+def create_react_lcel_code(config: Dict[str, Any], out: Optional[TextIO] = None) -> Optional[str]:
+    return _emit(_LCEL_MODULE_TPL.format_map({
+        "tools_section": _tools_section(config, "implement actual logic for the tool"),
+        "agent_block": _agent_block(config, _LCEL_AGENT_TPL),
+    }), out)
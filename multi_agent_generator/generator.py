@@ -3,118 +3,39 @@
 Agent configuration generator that analyzes user requirements.
 Unified across multiple LLM providers via LiteLLM.
 """
+import asyncio
+import collections
+import copy
+import functools
+import hashlib
 import os
 import json
-import streamlit as st
-from typing import Dict, Any, Optional, List
-from .model_inference import ModelInference, Message
+import pkgutil
+import logging
+import re
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Deque, Mapping, Optional, List, Tuple
+from ._fast import prompt_fingerprint
+from .assignment import assign_agents
+from .model_inference import (
+    ModelInference, Message, clear_model_cache, create_model_inference, load_env_if_needed
+)
+from .prompt_cache import SemanticCache
+from .router import Framework, FrameworkRouter
+from .schemas import copy_config, normalize_config, response_format_for
 
+logger = logging.getLogger(__name__)
 
-class AgentGenerator:
-    """
-    Generates agent configurations based on natural language descriptions.
-    Uses LiteLLM for provider-agnostic inference.
-    """
-
-    def __init__(self, provider: str = "openai"):
-        """
-        Initialize the generator with the specified provider.
-
-        Args:
-            provider: The LLM provider to use (openai, watsonx, ollama, etc.)
-        """
-        self.provider = provider.lower()
-        self.model: Optional[ModelInference] = None
-
-    def set_provider(self, provider: str):
-        """
-        Change the LLM provider.
-
-        Args:
-            provider: The LLM provider (openai, watsonx, ollama, etc.)
-        """
-        self.provider = provider.lower()
-        self.model = None  # reset for re-init
-
-    def _initialize_model(self):
-        """Initialize the LiteLLM ModelInference if not already done."""
-        if self.model is not None:
-            return
-
-        # Pick sensible defaults per provider
-        default_models = {
-            "openai": "gpt-4o-mini",
-            "watsonx": "watsonx/meta-llama/llama-3-3-70b-instruct",
-            "ollama": "ollama/llama3.2:3b",
-            "gemini": "gemini/gemini-2.0-flash-exp"
-        }
-        model_name = default_models.get(self.provider, self.provider)
-
-        # Allow overriding via environment variable DEFAULT_MODEL
-        model_name = os.getenv("DEFAULT_MODEL", model_name)
-
-        self.model = ModelInference(
-            model=model_name,
-            max_tokens=1000,
-            temperature=0.7,
-            top_p=0.95,
-            frequency_penalty=0,
-            presence_penalty=0,
-            project_id=os.getenv("WATSONX_PROJECT_ID")
-        )
-
-    def analyze_prompt(self, user_prompt: str, framework: str) -> Dict[str, Any]:
-        """
-        Analyze a natural language prompt to generate agent configuration.
-
-        Args:
-            user_prompt: The natural language description
-            framework: The agent framework to use
-
-        Returns:
-            A dictionary containing the agent configuration
-        """
-        self._initialize_model()
-        system_prompt = self._get_system_prompt_for_framework(framework)
-
-        try:
-            messages: List[Message] = [
-                Message(role="system", content=system_prompt),
-                Message(role="user", content=user_prompt)
-            ]
-
-            response = self.model.generate_text(messages)
 
-            # Extract JSON from response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
-            else:
-                if st is not None:
-                    st.warning("Could not extract valid JSON from model response. Using default configuration.")
-                return self._get_default_config(framework)
-
-        except Exception as e:
-            if st is not None:
-                st.error(f"Error in analyzing prompt: {e}")
-            return self._get_default_config(framework)
-
-
-    def _get_system_prompt_for_framework(self, framework: str) -> str:
-        """
-        Get the system prompt for the specified framework.
-        
-        Args:
-            framework: The agent framework to use
-            
-        Returns:
-            The system prompt for the framework
-        """
-        if framework == "crewai":
-            return """
+# System prompt sent with the user's request, per framework (as written;
+# dedented and interned below)
+_PROMPT_SOURCES: Dict[str, str] = {
+    "crewai": """
             You are an expert at creating AI research assistants using CrewAI. Based on the user's request,
             suggest appropriate agents, their roles, tools, and tasks. 
             
@@ -153,19 +74,10 @@ class AgentGenerator:
                 ]
             }
             
-            AGENT-TASK ASSIGNMENT RULES:
-            - Research tasks → Research Specialist/Analyst
-            - Data collection → Data Specialist/Collector  
-            - Analysis tasks → Data Analyst/Statistician
-            - Writing tasks → Content Writer/Technical Writer
-            - Review tasks → Quality Reviewer/Editor
-            - Coordination tasks → Project Manager/Coordinator
-            
             ALWAYS ensure each task has the most suitable agent assigned based on the agent's role and expertise.
             Use exact agent names (matching the "name" field in agents array) in the "agent" field of tasks.
-            """
-        elif framework == "crewai-flow":
-            return """
+            """,
+    "crewai-flow": """
             You are an expert at creating AI research assistants using CrewAI Flow. Based on the user's request,
             suggest appropriate agents, their roles, tools, and tasks organized in a workflow. 
             
@@ -205,9 +117,8 @@ class AgentGenerator:
             }
             
             ALWAYS ensure proper agent-to-task matching based on expertise and specialization.
-            """
-        elif framework == "langgraph":
-            return """
+            """,
+    "langgraph": """
             You are an expert at creating AI agents using LangChain's LangGraph framework. Based on the user's request,
             suggest appropriate agents, their roles, tools, and nodes for the graph. Format your response as JSON with this structure:
             {
@@ -235,9 +146,8 @@ class AgentGenerator:
                     }
                 ]
             }
-            """
-        elif framework == "react":
-            return """
+            """,
+    "react": """
             You are an expert at creating AI agents using the ReAct (Reasoning + Acting) framework. 
             Based on the user's request, design an agent with reasoning steps and tool usage.
 
@@ -272,9 +182,8 @@ class AgentGenerator:
                     }
                 ]
             }
-            """
-        elif framework == "react-lcel":
-            return """
+            """,
+    "react-lcel": """
             You are an expert at creating AI agents using the ReAct (Reasoning + Acting) framework, 
             implemented with LangChain Expression Language (LCEL). 
             The agent should demonstrate **multi-step reasoning** with clear intermediate steps.
@@ -320,13 +229,1031 @@ class AgentGenerator:
                     }
                 ]
             }
-            """
-        else:
-            return """
+            """,
+}
+
+_DEFAULT_PROMPT_SOURCE = """
             You are an expert at creating AI research assistants. Based on the user's request,
             suggest appropriate agents, their roles, tools, and tasks.
             """
 
+
+def _compile_prompt(prompt: str) -> str:
+    # Strip the source indentation once; interning keeps a single copy that
+    # is reused by identity (and is a byte-stable prefix for provider caches)
+    return sys.intern(textwrap.dedent(prompt).strip())
+
+
+_DEFAULT_PROMPT = _compile_prompt(_DEFAULT_PROMPT_SOURCE)
+
+
+@functools.lru_cache(maxsize=32)
+def _system_message(system_prompt: str) -> Message:
+    # One Message per distinct system prompt (the str caches its own hash);
+    # shared between requests, so it must not be modified
+    return Message(role="system", content=system_prompt)
+
+_EMPTY_CONFIG: Mapping[str, Any] = MappingProxyType({})
+
+# Fallback configuration per built-in framework, used when the model response
+# cannot be parsed; shipped as package data so it can be edited without code
+# changes. Callers get a copy, so these are never mutated.
+_BUILTIN_DEFAULT_CONFIGS: Dict[str, Dict[str, Any]] = json.loads(
+    pkgutil.get_data(__package__, "defaults.json")
+)
+
+# Registered frameworks: name -> compiled system prompt / fallback config
+_SYSTEM_PROMPTS: Dict[str, str] = {}
+_DEFAULT_CONFIGS: Dict[str, Dict[str, Any]] = {}
+# Read-only views of _DEFAULT_CONFIGS, built once per registration
+_DEFAULT_CONFIG_VIEWS: Dict[str, Mapping[str, Any]] = {}
+# Provider-side prompt cache routing key per framework (OpenAI's
+# prompt_cache_key). It embeds a digest of the system prompt, so editing a
+# prompt starts a new cache entry instead of needing a manual version bump
+_PROMPT_CACHE_KEYS: Dict[str, str] = {}
+# Completion token budget per framework, sized to its largest typical config
+_MAX_TOKENS: Dict[str, int] = {}
+_DEFAULT_MAX_TOKENS = 800
+
+# Hierarchical crews are the largest configs; a ReAct config is one agent
+# with a few tools
+_BUILTIN_MAX_TOKENS = {
+    "crewai": 1200,
+    "crewai-flow": 1200,
+    "langgraph": 500,
+    "react": 400,
+    "react-lcel": 900,
+}
+
+
+def register_framework(
+    name: str, system_prompt: str, default_config: Dict[str, Any], max_tokens: int = _DEFAULT_MAX_TOKENS
+) -> None:
+    """
+    Register a framework for prompt analysis, or replace a registered one.
+
+    Args:
+        name: Framework name passed to ``AgentGenerator.analyze_prompt``
+        system_prompt: Instructions sent to the model (indentation is stripped)
+        default_config: Configuration returned when the response cannot be parsed
+        max_tokens: Upper bound on the tokens generated for one analysis
+    """
+    _SYSTEM_PROMPTS[name] = _compile_prompt(system_prompt)
+    digest = hashlib.blake2b(_SYSTEM_PROMPTS[name].encode(), digest_size=4).hexdigest()
+    _PROMPT_CACHE_KEYS[name] = f"mag:{name}:{digest}"
+    _DEFAULT_CONFIGS[name] = copy.deepcopy(default_config)
+    _DEFAULT_CONFIG_VIEWS[name] = MappingProxyType(_DEFAULT_CONFIGS[name])
+    _MAX_TOKENS[name] = max_tokens
+
+
+for _name, _prompt in _PROMPT_SOURCES.items():
+    register_framework(_name, _prompt, _BUILTIN_DEFAULT_CONFIGS[_name], _BUILTIN_MAX_TOKENS[_name])
+del _name, _prompt
+
+
+# Credentials each provider needs: name -> (environment variables, Streamlit
+# session_state key set by the web UI)
+_CREDENTIALS: Dict[str, Dict[str, Tuple[Tuple[str, ...], str]]] = {
+    "openai": {
+        "api_key": (("OPENAI_API_KEY",), "openai_api_key"),
+    },
+    "watsonx": {
+        "api_key": (("WATSONX_API_KEY",), "watsonx_api_key"),
+        "project_id": (("WATSONX_PROJECT_ID",), "watsonx_project_id"),
+    },
+    "gemini": {
+        "api_key": (("GEMINI_API_KEY", "GOOGLE_API_KEY"), "gemini_api_key"),
+    },
+}
+
+
+# Model used for each provider unless DEFAULT_MODEL is set; other provider
+# names are passed to LiteLLM as the model name
+_DEFAULT_MODELS: Dict[str, str] = {
+    "openai": "gpt-4o-mini",
+    "watsonx": "watsonx/meta-llama/llama-3-3-70b-instruct",
+    "ollama": "ollama/llama3.2:3b",
+    "gemini": "gemini/gemini-2.0-flash-exp",
+}
+
+
+def register_provider(
+    name: str,
+    default_model: str,
+    credentials: Optional[Mapping[str, Tuple[Tuple[str, ...], str]]] = None,
+) -> None:
+    """
+    Register an LLM provider, or replace a registered one.
+
+    Args:
+        name: Provider name passed to ``AgentGenerator`` (case-insensitive)
+        default_model: LiteLLM model used unless ``DEFAULT_MODEL`` is set
+        credentials: Required credentials as ``name -> (environment variables,
+            web UI session_state key)``; ``api_key`` and ``project_id`` are
+            passed to the model. None if the provider needs none
+    """
+    name = name.lower()
+    _DEFAULT_MODELS[name] = default_model
+    _model_name.cache_clear()
+    if credentials:
+        _CREDENTIALS[name] = {key: (tuple(env_vars), state_key) for key, (env_vars, state_key) in credentials.items()}
+    else:
+        _CREDENTIALS.pop(name, None)
+
+
+@functools.lru_cache(maxsize=None)
+def _model_name(provider: str) -> str:
+    """LiteLLM model for ``provider``: DEFAULT_MODEL if set, else the provider's default."""
+    return os.getenv("DEFAULT_MODEL", _DEFAULT_MODELS.get(provider, provider))
+
+
+@functools.lru_cache(maxsize=1)
+def _endpoint_settings() -> Tuple[Optional[str], Optional[str]]:
+    """API_BASE and WATSONX_PROJECT_ID, read once (after any .env file is loaded)."""
+    return os.getenv("API_BASE"), os.getenv("WATSONX_PROJECT_ID")
+
+
+class MissingCredentialsError(RuntimeError):
+    """Raised when a provider's required credentials are not configured."""
+
+
+def _streamlit():
+    """
+    Return the streamlit module when running inside a Streamlit app, else None.
+
+    Streamlit is never imported here; it is only used if the app already loaded it.
+    Probed by ``_resolve_credentials`` (once per model initialization) and by
+    ``_notify`` (once per warning or error shown). Neither runs in the hot
+    path, and the runtime can start after import, so the result is not cached.
+    """
+    st = sys.modules.get("streamlit")
+    if st is None:
+        return None
+    try:
+        from streamlit.runtime import exists
+    except ImportError:
+        return None
+    return st if exists() else None
+
+
+def _resolve(env_vars: Tuple[str, ...], state_key: str, st=None) -> Optional[str]:
+    """First set environment variable of ``env_vars``, else the UI session value."""
+    for var in env_vars:
+        value = os.getenv(var)
+        if value:
+            return value
+    if st is not None:
+        return st.session_state.get(state_key) or None
+    return None
+
+
+def _notify(level: int, message: str) -> None:
+    """Log ``message`` and, inside the web UI, show it to the user."""
+    logger.log(level, message)
+    st = _streamlit()
+    if st is not None:
+        (st.error if level >= logging.ERROR else st.warning)(message)
+
+
+# Sampling parameters of every analysis call; max_tokens is replaced by the
+# framework's own budget (see register_framework)
+DEFAULT_MODEL_PARAMS: Mapping[str, Any] = MappingProxyType({
+    "max_tokens": _DEFAULT_MAX_TOKENS,
+    "temperature": 0.7,
+    "top_p": 0.95,
+    "frequency_penalty": 0,
+    "presence_penalty": 0,
+})
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+try:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+
+# Characters _JsonObjectScanner acts on, outside and inside JSON strings
+_STRUCTURAL = re.compile(r'[{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class _JsonObjectScanner:
+    """
+    Find the first complete top-level JSON object in text that arrives in chunks.
+
+    Tracks brace depth (ignoring braces inside JSON strings) so the object can
+    be decoded as soon as its closing brace arrives, without waiting for the
+    rest of the response.
+    """
+    __slots__ = ("_chunks", "_length", "_depth", "_start", "_in_string", "_escape", "_gave_up")
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._length = 0
+        self._depth = 0
+        self._start = 0
+        self._in_string = False
+        self._escape = False
+        self._gave_up = False
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """Consume ``chunk``; return the object once one has closed, else None."""
+        base = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        if self._gave_up:
+            return None
+        # Jump between the characters that change the state instead of
+        # stepping through every character in Python
+        i = 0
+        if self._escape:
+            # The previous chunk ended with a backslash inside a string
+            self._escape = False
+            i = 1
+        n = len(chunk)
+        while i < n:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(chunk, i)
+                if match is None:
+                    break
+                j = match.start()
+                if chunk[j] == "\\":
+                    # Skip the escaped character, which may be in the next chunk
+                    i = j + 2
+                    self._escape = i > n
+                else:
+                    self._in_string = False
+                    i = j + 1
+                continue
+            match = _STRUCTURAL.search(chunk, i)
+            if match is None:
+                break
+            j = match.start()
+            i = j + 1
+            c = chunk[j]
+            if c == '"':
+                # Quotes in surrounding prose do not start a JSON string
+                self._in_string = self._depth > 0
+            elif c == "{":
+                if self._depth == 0:
+                    self._start = base + j
+                self._depth += 1
+            elif self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = self._decode(base + i)
+                    if obj is not None:
+                        return obj
+                    # Braces or quotes in prose threw off the tracking; leave
+                    # it to _decode_first_object over the full text
+                    self._gave_up = True
+                    return None
+        return None
+
+    def _decode(self, end: int) -> Optional[Dict[str, Any]]:
+        # Accept only an object spanning exactly the scanned braces
+        try:
+            obj = _loads(self.text[self._start:end])
+        except json.JSONDecodeError:
+            return None
+        if isinstance(obj, dict) and obj:
+            return obj
+        return None
+
+
+def _extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the first JSON object embedded in ``text``, or None.
+
+    A single brace-balanced scan finds the object, so only its own text is
+    decoded and prose or code fences around it are ignored.
+    """
+    obj = _JsonObjectScanner().feed(text)
+    if obj is not None:
+        return obj
+    return _decode_first_object(text)
+
+
+def _decode_first_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Slow path of ``_extract_json``: try decoding at each ``{`` in turn.
+
+    Used when braces or quotes in the surrounding prose throw off the scan.
+    """
+    start = text.find('{')
+    while start != -1:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            start = text.find('{', start + 1)
+            continue
+        # Skip stray literals such as "{}" in the surrounding prose
+        if isinstance(obj, dict) and obj:
+            return obj
+        start = text.find('{', start + 1)
+    return None
+
+
+# Requests analyze_many keeps in flight unless told otherwise; bounded so a
+# large batch does not exhaust the HTTP client's connection pool
+# (AGENT_CONCURRENCY, read when needed)
+_DEFAULT_CONCURRENCY = 8
+
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Integer environment variable, at least ``minimum``; ``default`` (with a warning) if malformed."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return max(minimum, int(value))
+    except ValueError:
+        logger.warning("Ignoring %s=%r: not an integer; using %d", name, value, default)
+        return default
+
+
+def _env_float(name: str, default: float, minimum: float = 0.0) -> float:
+    """Number from the environment, at least ``minimum``; ``default`` (with a warning) if malformed."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return max(minimum, float(value))
+    except ValueError:
+        logger.warning("Ignoring %s=%r: not a number; using %g", name, value, default)
+        return default
+
+
+class _BackgroundCall:
+    """
+    Run a function on a daemon thread and wait for it with a timeout.
+
+    The thread does not keep the process alive, so a caller that stops
+    waiting is not blocked at exit by the call it gave up on.
+    """
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._error: Optional[BaseException] = None
+        self._late: Optional[Callable[[Any], None]] = None
+        threading.Thread(target=self._run, args=(func, args), name="agent-generator", daemon=True).start()
+
+    def _run(self, func: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+        try:
+            self._value = func(*args)
+        except Exception as e:
+            self._error = e
+        with self._lock:
+            self._done.set()
+            late = self._late
+        if late is not None:
+            self._deliver(late)
+
+    def wait(self, timeout: float) -> bool:
+        """Whether the call finished within ``timeout`` seconds."""
+        return self._done.wait(timeout)
+
+    def result(self) -> Any:
+        """Return the call's result or raise its error; only after ``wait`` returned True."""
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def on_late_result(self, callback: Callable[[Any], None]) -> None:
+        """Pass the result to ``callback`` once the call succeeds; failures are only logged."""
+        with self._lock:
+            if not self._done.is_set():
+                self._late = callback
+                return
+        self._deliver(callback)
+
+    def _deliver(self, callback: Callable[[Any], None]) -> None:
+        if self._error is not None:
+            logger.debug("Model call finished after the soft timeout with an error: %s", self._error)
+        elif self._value is not None:
+            callback(self._value)
+
+
+# Frameworks whose tasks name their agent; tasks the model left unassigned
+# are matched to an agent locally (see assign_agents)
+_ASSIGNS_AGENTS = frozenset({Framework.CREWAI, Framework.CREWAI_FLOW})
+
+# Resolves framework="auto" from the keywords in the prompt
+_ROUTER = FrameworkRouter()
+
+# User message of analyze_prompts_batched, followed by the numbered requests
+_BATCH_INSTRUCTIONS = (
+    'Answer each request below with a configuration in the JSON format described above. '
+    'Return a single JSON object {"configs": [...]} holding one configuration per request, in order.\n\n'
+)
+
+# Output tokens analyze_prompts_batched asks for in one call unless told
+# otherwise (AGENT_BATCH_MAX_TOKENS); prompts are split over several calls
+# to stay within it, as most models cap their output at 4k-16k tokens
+_DEFAULT_BATCH_MAX_TOKENS = 4096
+
+# Analyses kept per AgentGenerator, e.g. across reruns of a web UI session
+_RESPONSE_CACHE_SIZE = 64
+
+# Directory for analyses persisted across processes (see AgentGenerator's cache_dir)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "multi_agent_generator", "analyze")
+
+
+def _atomic_write(path: str, write) -> None:
+    """Write a file through a temp file in the same directory, then rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class AgentGenerator:
+    """
+    Generates agent configurations based on natural language descriptions.
+    Uses LiteLLM for provider-agnostic inference.
+    """
+    __slots__ = (
+        "provider", "model", "cache_dir", "semantic_cache", "semantic_thresholds",
+        "soft_timeout", "_response_cache", "_cache_ttl", "_late_results",
+    )
+
+    def __init__(
+        self,
+        provider: str = "openai",
+        cache_dir: Optional[str] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        semantic_thresholds: Optional[Dict[str, float]] = None,
+        soft_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the generator with the specified provider.
+
+        Args:
+            provider: The LLM provider to use (openai, watsonx, ollama, etc.)
+            cache_dir: If given, analyses are also stored there as JSON files
+                and reused by later processes (e.g. ``DEFAULT_CACHE_DIR``)
+            semantic_cache: If given, prompts similar to a previously analyzed
+                one reuse its configuration on an exact-match miss
+            semantic_thresholds: Per-framework similarity thresholds overriding
+                the semantic cache's own
+            soft_timeout: Seconds ``analyze_prompt`` waits for the model before
+                returning the default configuration (default: AGENT_SOFT_TIMEOUT,
+                or 0, which waits for the full request)
+        """
+        self.provider = provider.lower()
+        self.model: Optional[ModelInference] = None
+        self.cache_dir = cache_dir
+        self.semantic_cache = semantic_cache
+        self.semantic_thresholds = dict(semantic_thresholds or {})
+        if soft_timeout is None:
+            soft_timeout = _env_float("AGENT_SOFT_TIMEOUT", 0.0)
+        self.soft_timeout = soft_timeout
+        # Parsed configurations keyed by provider, model, framework and prompt,
+        # with the time they were stored; entries older than AGENT_CACHE_TTL
+        # seconds are ignored and at most _RESPONSE_CACHE_SIZE are kept
+        self._response_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._cache_ttl = _env_float("AGENT_CACHE_TTL", 86400.0)
+        # Configs of requests that finished after analyze_prompt's soft
+        # timeout, appended by their threads and cached by the next analysis,
+        # so the caches are only written from the callers' threads
+        self._late_results: Deque[Tuple[str, Dict[str, Any], str, str]] = collections.deque()
+
+    def clear_cache(self):
+        """Forget all cached prompt analyses held in memory; files in ``cache_dir`` are kept."""
+        self._response_cache.clear()
+
+    @staticmethod
+    def close_pool():
+        """
+        Drop the ModelInference instances shared by all generators.
+
+        Generators that already hold a model keep it; later initializations
+        build new ones and read DEFAULT_MODEL, API_BASE and WATSONX_PROJECT_ID
+        again (e.g. after credentials changed).
+        """
+        clear_model_cache()
+        _model_name.cache_clear()
+        _endpoint_settings.cache_clear()
+
+    def set_provider(self, provider: str):
+        """
+        Change the LLM provider.
+
+        With MAG_WARMUP=1 the new model is set up in the background and sent
+        a one-token request, so the next analysis finds an open connection.
+
+        Args:
+            provider: The LLM provider (openai, watsonx, ollama, etc.)
+        """
+        self.provider = provider.lower()
+        self.model = None  # reset for re-init
+        if os.getenv("MAG_WARMUP", "0") == "1":
+            # A daemon thread of its own, so warming up neither delays exit
+            # nor holds up the analyses
+            threading.Thread(
+                target=self._warmup, args=(self.provider,), name="agent-generator-warmup", daemon=True
+            ).start()
+
+    def _warmup(self, provider: str) -> None:
+        """Set up ``provider``'s model and open a connection to it; failures are only logged."""
+        try:
+            model = self._build_model(provider)
+            # Only if the provider was not changed again in the meantime
+            if self.provider == provider and self.model is None:
+                self.model = model
+            model.prewarm()
+        except Exception as e:
+            logger.debug("Warm-up failed: %s", e)
+
+    def _initialize_model(self):
+        """Initialize the LiteLLM ModelInference if not already done."""
+        if self.model is None:
+            self.model = self._build_model(self.provider)
+
+    @classmethod
+    def _build_model(cls, provider: str) -> ModelInference:
+        """Return the ModelInference for ``provider``."""
+        # DEFAULT_MODEL / WATSONX_PROJECT_ID may come from a .env file
+        load_env_if_needed()
+
+        credentials = cls._resolve_credentials(provider)
+        api_base, project_id = _endpoint_settings()
+
+        # Shared by all generators: Streamlit re-runs the app script on every
+        # interaction and creates a new AgentGenerator each time
+        return create_model_inference(
+            _model_name(provider),
+            credentials.get("api_key"),
+            api_base,
+            project_id=credentials.get("project_id", project_id),
+            **DEFAULT_MODEL_PARAMS,
+        )
+
+    @staticmethod
+    def _resolve_credentials(provider: str) -> Dict[str, Optional[str]]:
+        """
+        Look up the credentials required by ``provider``.
+
+        Environment variables take precedence; inside the web UI, values entered
+        in the sidebar (``st.session_state``) are used as a fallback. Providers
+        without required credentials (e.g. ollama) resolve to an empty dict and
+        LiteLLM's own environment handling applies.
+
+        Raises:
+            MissingCredentialsError: If a required credential is not set
+        """
+        required = _CREDENTIALS.get(provider)
+        if not required:
+            return {}
+
+        st = _streamlit()
+        credentials: Dict[str, Optional[str]] = {}
+        missing = []
+        for name, (env_vars, state_key) in required.items():
+            value = _resolve(env_vars, state_key, st)
+            if not value:
+                missing.append(" or ".join(env_vars))
+            credentials[name] = value
+
+        if missing:
+            raise MissingCredentialsError(
+                f"Missing credentials for provider '{provider}': set {', '.join(missing)}"
+            )
+        return credentials
+
+    def analyze_prompt(self, user_prompt: str, framework: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Analyze a natural language prompt to generate agent configuration.
+
+        Args:
+            user_prompt: The natural language description
+            framework: The agent framework to use, or "auto" to pick one from
+                the prompt (see ``FrameworkRouter``)
+            use_cache: If False, always query the model and do not store the result
+
+        Returns:
+            A dictionary containing the agent configuration; the default one
+            if the model does not answer within ``soft_timeout`` seconds
+
+        Raises:
+            MissingCredentialsError: If the provider's credentials are not set
+        """
+        if framework == "auto":
+            framework = _ROUTER.route_one(user_prompt)
+        key, messages, cached = self._prepare_analysis(user_prompt, framework, use_cache)
+        if cached is not None:
+            return cached
+
+        try:
+            if not self.soft_timeout:
+                return self._analyze_streaming(key, messages, user_prompt, framework)
+            call = _BackgroundCall(self._stream_config, messages, framework)
+            if not call.wait(self.soft_timeout):
+                # The request keeps running; once it completes its result is
+                # cached, so asking again returns it without waiting
+                if key is not None:
+                    call.on_late_result(
+                        lambda config: self._late_results.append((key, config, user_prompt, framework))
+                    )
+                _notify(logging.WARNING, f"Model did not answer within {self.soft_timeout:g}s. Using default configuration.")
+                return self._get_default_config(framework)
+            return self._finish_analysis(key, call.result(), user_prompt, framework)
+
+        except Exception as e:
+            _notify(logging.ERROR, f"Error in analyzing prompt: {e}")
+            return self._get_default_config(framework)
+
+    def _analyze_streaming(
+        self, key: Optional[str], messages: List[Message], user_prompt: str, framework: str
+    ) -> Dict[str, Any]:
+        """Query the model for a config and cache it; errors are left to the caller."""
+        config = self._stream_config(messages, framework)
+        return self._finish_analysis(key, config, user_prompt, framework)
+
+    def _stream_config(self, messages: List[Message], framework: str) -> Optional[Dict[str, Any]]:
+        """Stream the model response and parse the config in it, if any."""
+        # Stream the response and stop reading once the JSON object closes;
+        # any trailing prose from the model is never waited for
+        scanner = _JsonObjectScanner()
+        config = None
+        stream = self.model.generate_text_stream(messages, **self._response_params(framework))
+        try:
+            for chunk in stream:
+                config = scanner.feed(chunk)
+                if config is not None:
+                    break
+        finally:
+            stream.close()
+        if config is None:
+            text = scanner.text
+            if text:
+                config = _decode_first_object(text)
+            else:
+                # Providers without streaming support can yield no deltas;
+                # ask again without streaming
+                config = _extract_json(self.model.generate_text(messages, **self._response_params(framework)))
+        return config
+
+    async def analyze_prompt_async(
+        self, user_prompt: str, framework: str, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Asynchronous version of ``analyze_prompt``.
+
+        Args:
+            user_prompt: The natural language description
+            framework: The agent framework to use, or "auto"
+            use_cache: If False, always query the model and do not store the result
+
+        Returns:
+            A dictionary containing the agent configuration
+        """
+        if framework == "auto":
+            framework = _ROUTER.route_one(user_prompt)
+        key, messages, cached = self._prepare_analysis(user_prompt, framework, use_cache)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.model.agenerate_text(messages, **self._response_params(framework))
+            return self._config_from_response(key, response, user_prompt, framework)
+
+        except Exception as e:
+            _notify(logging.ERROR, f"Error in analyzing prompt: {e}")
+            return self._get_default_config(framework)
+
+    async def analyze_many(
+        self, items: List[Tuple[str, str]], concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several prompts concurrently.
+
+        Args:
+            items: ``(user_prompt, framework)`` pairs
+            concurrency: Maximum number of requests in flight at once
+                (default: AGENT_CONCURRENCY, or 8)
+
+        Returns:
+            The configurations, in the same order as ``items``; repeated
+            items are analyzed once and receive separate copies
+        """
+        semaphore = asyncio.Semaphore(concurrency or _env_int("AGENT_CONCURRENCY", _DEFAULT_CONCURRENCY))
+
+        async def analyze_one(user_prompt: str, framework: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_prompt_async(user_prompt, framework)
+
+        # Index of each distinct (prompt, framework) pair in ``unique``
+        positions: Dict[Tuple[str, str], int] = {}
+        unique: List[Tuple[str, str]] = []
+        for item in items:
+            if item not in positions:
+                positions[item] = len(unique)
+                unique.append(item)
+
+        results = await asyncio.gather(*(analyze_one(p, f) for p, f in unique))
+        if len(unique) == len(items):
+            return results
+
+        out: List[Dict[str, Any]] = []
+        handed_out = [False] * len(unique)
+        for item in items:
+            i = positions[item]
+            out.append(copy_config(results[i]) if handed_out[i] else results[i])
+            handed_out[i] = True
+        return out
+
+    def analyze_prompts_batch(
+        self, items: List[Tuple[str, str]], concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Synchronous version of ``analyze_many``.
+
+        The requests run concurrently, so the batch takes about as long as
+        its slowest prompt; cached prompts do not issue a request. Must not be
+        called from a running event loop (await ``analyze_many`` there).
+
+        Args:
+            items: ``(user_prompt, framework)`` pairs
+            concurrency: Maximum number of requests in flight at once
+                (default: AGENT_CONCURRENCY, or 8)
+
+        Returns:
+            The configurations, in the same order as ``items``
+        """
+        return asyncio.run(self.analyze_many(items, concurrency))
+
+    def analyze_prompts_batched(
+        self,
+        prompts: List[str],
+        framework: str,
+        use_cache: bool = True,
+        max_tokens: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several prompts for one framework with as few model calls as possible.
+
+        The system prompt is sent once per call instead of once per prompt;
+        a call holds as many prompts as fit in ``max_tokens`` output tokens
+        at the framework's per-prompt budget. Prompts found in the cache are
+        not sent; a config missing from or invalid in the reply falls back to
+        the default configuration.
+
+        Args:
+            prompts: The natural language descriptions
+            framework: The agent framework to use for all of them ("auto" is
+                not supported, as the batch shares one system prompt)
+            use_cache: If False, always query the model and do not store the results
+            max_tokens: Output tokens requested per call (default:
+                AGENT_BATCH_MAX_TOKENS, or 4096); a call always holds at
+                least one prompt
+
+        Returns:
+            The configurations, in the same order as ``prompts``
+
+        Raises:
+            ValueError: If ``framework`` is "auto"
+            MissingCredentialsError: If the provider's credentials are not set
+        """
+        if framework == "auto":
+            raise ValueError("analyze_prompts_batched needs a framework; route the prompts first")
+        results: List[Optional[Dict[str, Any]]] = [None] * len(prompts)
+        # Distinct uncached prompt -> (cache key, positions in ``prompts``)
+        pending: Dict[str, Tuple[Optional[str], List[int]]] = {}
+        for i, user_prompt in enumerate(prompts):
+            if user_prompt in pending:
+                pending[user_prompt][1].append(i)
+                continue
+            key, _, cached = self._prepare_analysis(user_prompt, framework, use_cache)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[user_prompt] = (key, [i])
+        if not pending:
+            return results
+
+        if max_tokens is None:
+            max_tokens = _env_int("AGENT_BATCH_MAX_TOKENS", _DEFAULT_BATCH_MAX_TOKENS)
+        per_prompt = self._response_params(framework)["max_tokens"]
+        size = max(1, max_tokens // per_prompt)
+        items = list(pending.items())
+        system_message = _system_message(self._get_system_prompt_for_framework(framework))
+        for start in range(0, len(items), size):
+            chunk = items[start:start + size]
+            configs = self._analyze_chunk(system_message, [user_prompt for user_prompt, _ in chunk], framework)
+            for n, (user_prompt, (key, positions)) in enumerate(chunk):
+                if configs is None:
+                    config = self._get_default_config(framework)
+                else:
+                    config = configs[n] if n < len(configs) and isinstance(configs[n], dict) else None
+                    config = self._finish_analysis(key, config, user_prompt, framework)
+                for j, i in enumerate(positions):
+                    results[i] = copy_config(config) if j else config
+        return results
+
+    def _analyze_chunk(
+        self, system_message: Message, prompts: List[str], framework: str
+    ) -> Optional[List[Any]]:
+        """
+        Ask for the configs of ``prompts`` in one call.
+
+        Returns:
+            The reply's list of configs (possibly short or empty), or None if
+            the call failed; the failure is reported once for all prompts
+        """
+        requests = "".join(f"{n}) {p}\n" for n, p in enumerate(prompts, 1))
+        batch = [system_message, Message(role="user", content=_BATCH_INSTRUCTIONS + requests)]
+        params = self._response_params(framework)
+        params["max_tokens"] *= len(prompts)
+        if "response_format" in params:
+            # The framework's schema describes one config, not the wrapper
+            params["response_format"] = {"type": "json_object"}
+        try:
+            reply = _extract_json(self.model.generate_text(batch, **params)) or {}
+        except Exception as e:
+            _notify(logging.ERROR, f"Error in analyzing {len(prompts)} prompts: {e}. Using default configurations.")
+            return None
+        configs = reply.get("configs")
+        return configs if isinstance(configs, list) else []
+
+    def _prepare_analysis(
+        self, user_prompt: str, framework: str, use_cache: bool = True
+    ) -> Tuple[Optional[str], List[Message], Optional[Dict[str, Any]]]:
+        """
+        Return the cache key, the messages to send and a cached config (if any).
+
+        The key is None when ``use_cache`` is False, so the result is not stored.
+        """
+        self._initialize_model()
+        self._store_late_results()
+        system_prompt = self._get_system_prompt_for_framework(framework)
+        messages: List[Message] = [
+            _system_message(system_prompt),
+            Message(role="user", content=user_prompt)
+        ]
+        if not use_cache:
+            return None, messages, None
+
+        # Prompts differing only in case or whitespace share an entry; the
+        # temperature is part of the key as it changes what may be reused
+        temperature = self.model.default_params.get("temperature")
+        key = prompt_fingerprint(
+            user_prompt, f"{self.provider}|{self.model.model}|{temperature}|{framework}|{system_prompt}"
+        )
+
+        cached = self._response_cache.pop(key, None)
+        if cached is not None:
+            stored_at, config = cached
+            if time.time() - stored_at < self._cache_ttl:
+                # Re-insert so the entry becomes the most recently used
+                self._response_cache[key] = cached
+                return key, messages, copy_config(config)
+
+        config = self._load_persisted(key)
+        if config is None and self.semantic_cache is not None:
+            config = self.semantic_cache.get(
+                user_prompt, self._semantic_namespace(framework), self.semantic_thresholds.get(framework)
+            )
+        if config is not None:
+            try:
+                # Entries written before a schema change are treated as misses
+                stored = normalize_config(framework, config)
+            except ValueError:
+                return key, messages, None
+            self._remember(key, stored)
+            return key, messages, copy_config(stored)
+        return key, messages, None
+
+    def _semantic_namespace(self, framework: str) -> str:
+        return f"{self.provider}|{self.model.model}|{framework}"
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_persisted(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an analysis stored in ``cache_dir`` within the TTL, if any."""
+        if self.cache_dir is None:
+            return None
+        path = self._cache_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) >= self._cache_ttl:
+                return None
+            with open(path, "rb") as f:
+                return _loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _persist(self, key: str, config: Dict[str, Any]) -> None:
+        """Store an analysis in ``cache_dir``; failures only lose the cache entry."""
+        if self.cache_dir is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Concurrent processes never see a partially written file
+            _atomic_write(self._cache_path(key), lambda f: f.write(json.dumps(config).encode()))
+        except OSError:
+            pass
+
+    def _remember(self, key: str, config: Dict[str, Any]) -> None:
+        """
+        Add a config to the in-memory cache, evicting the least recently used entry.
+
+        The cache keeps ``config`` itself, so it must not be handed to callers.
+        """
+        if len(self._response_cache) >= _RESPONSE_CACHE_SIZE:
+            # Dicts preserve insertion order, so the first entry is the oldest
+            self._response_cache.pop(next(iter(self._response_cache)))
+        self._response_cache[key] = (time.time(), config)
+
+    def _store(self, key: str, stored: Dict[str, Any], user_prompt: str, framework: str) -> None:
+        """Add a validated config to every cache."""
+        self._remember(key, stored)
+        self._persist(key, stored)
+        if self.semantic_cache is not None:
+            self.semantic_cache.put(user_prompt, self._semantic_namespace(framework), stored)
+
+    def _store_late_results(self) -> None:
+        """Cache the configs of requests that outlived the soft timeout; invalid ones are dropped."""
+        while self._late_results:
+            key, config, user_prompt, framework = self._late_results.popleft()
+            if framework in _ASSIGNS_AGENTS:
+                assign_agents(config)
+            try:
+                stored = normalize_config(framework, config)
+            except ValueError:
+                continue
+            self._store(key, stored, user_prompt, framework)
+
+    def _response_params(self, framework: str) -> Dict[str, Any]:
+        """Per-call completion parameters: the framework's token budget and JSON mode."""
+        params: Dict[str, Any] = {"max_tokens": _MAX_TOKENS.get(framework, _DEFAULT_MAX_TOKENS)}
+        # The reply is still parsed leniently and validated, as JSON mode does
+        # not enforce the schema and some local models ignore it
+        response_format = response_format_for(framework) if self.model.schema_mode else None
+        if response_format is not None:
+            # A copy, so the request can never change the shared schema
+            params["response_format"] = copy_config(response_format)
+        elif self.model.json_mode:
+            params["response_format"] = {"type": "json_object"}
+        # Route requests sharing the system prompt to the same prompt cache
+        if "prompt_cache_key" in self.model.supported_params and framework in _PROMPT_CACHE_KEYS:
+            params["prompt_cache_key"] = _PROMPT_CACHE_KEYS[framework]
+        return params
+
+    def _config_from_response(
+        self, key: Optional[str], response: str, user_prompt: str, framework: str
+    ) -> Dict[str, Any]:
+        """Parse the model response, caching it, or fall back to the default config."""
+        # Extract JSON from response
+        return self._finish_analysis(key, _extract_json(response), user_prompt, framework)
+
+    def _finish_analysis(
+        self, key: Optional[str], config: Optional[Dict[str, Any]], user_prompt: str, framework: str
+    ) -> Dict[str, Any]:
+        """Cache a parsed config, or fall back to the default config if there is none or it is invalid."""
+        if config is not None:
+            if framework in _ASSIGNS_AGENTS:
+                assign_agents(config)
+            try:
+                # Validation and the copy kept by the caches share one pass
+                stored = normalize_config(framework, config)
+            except ValueError as e:
+                _notify(logging.WARNING, f"Model response does not match the {framework} schema ({e}). Using default configuration.")
+                return self._get_default_config(framework)
+            if key is not None:
+                self._store(key, stored, user_prompt, framework)
+            return config
+        else:
+            _notify(logging.WARNING, "Could not extract valid JSON from model response. Using default configuration.")
+            return self._get_default_config(framework)
+
+
+    def _get_system_prompt_for_framework(self, framework: str) -> str:
+        """
+        Get the system prompt for the specified framework.
+        
+        Args:
+            framework: The agent framework to use
+            
+        Returns:
+            The system prompt for the framework
+        """
+        return _SYSTEM_PROMPTS.get(framework, _DEFAULT_PROMPT)
+
     def _get_default_config(self, framework: str) -> Dict[str, Any]:
         """
         Get a default configuration for the specified framework.
@@ -337,154 +1264,21 @@ class AgentGenerator:
         Returns:
             A default configuration dictionary
         """
-        if framework == "crewai":
-            return {
-                "process": "sequential",  # Default to sequential
-                "agents": [
-                    {
-                        "name": "research_specialist",
-                        "role": "Research Specialist",
-                        "goal": "Conduct thorough research and gather information",
-                        "backstory": "Expert researcher with years of experience in data gathering and analysis",
-                        "tools": ["search_tool", "web_scraper"],
-                        "verbose": True,
-                        "allow_delegation": False
-                    },
-                    {
-                        "name": "content_writer",
-                        "role": "Content Writer",
-                        "goal": "Create clear and comprehensive written content",
-                        "backstory": "Professional writer skilled in creating engaging and informative content",
-                        "tools": ["writing_tool", "grammar_checker"],
-                        "verbose": True,
-                        "allow_delegation": False
-                    }
-                ],
-                "tasks": [
-                    {
-                        "name": "research_task",
-                        "description": "Gather information and conduct research on the given topic",
-                        "tools": ["search_tool"],
-                        "agent": "research_specialist",
-                        "expected_output": "Comprehensive research findings and data"
-                    },
-                    {
-                        "name": "writing_task",
-                        "description": "Create written content based on research findings",
-                        "tools": ["writing_tool"],
-                        "agent": "content_writer",
-                        "expected_output": "Well-written content document"
-                    }
-                ]
-            }
-        elif framework == "crewai-flow":
-            return {
-                "process": "sequential",  # Default to sequential
-                "agents": [
-                    {
-                        "name": "research_specialist",
-                        "role": "Research Specialist",
-                        "goal": "Conduct thorough research and gather information",
-                        "backstory": "Expert researcher with years of experience in data gathering and analysis",
-                        "tools": ["search_tool", "web_scraper"],
-                        "verbose": True,
-                        "allow_delegation": False
-                    },
-                    {
-                        "name": "content_writer",
-                        "role": "Content Writer",
-                        "goal": "Create clear and comprehensive written content",
-                        "backstory": "Professional writer skilled in creating engaging and informative content",
-                        "tools": ["writing_tool", "grammar_checker"],
-                        "verbose": True,
-                        "allow_delegation": False
-                    }
-                ],
-                "tasks": [
-                    {
-                        "name": "research_task",
-                        "description": "Gather information and conduct research on the given topic",
-                        "tools": ["search_tool"],
-                        "agent": "research_specialist",
-                        "expected_output": "Comprehensive research findings and data"
-                    },
-                    {
-                        "name": "writing_task",
-                        "description": "Create written content based on research findings",
-                        "tools": ["writing_tool"],
-                        "agent": "content_writer",
-                        "expected_output": "Well-written content document"
-                    }
-                ]
-            }
-        
-        elif framework == "langgraph":
-            return {
-                "agents": [{
-                    "name": "default_assistant",
-                    "role": "General Assistant",
-                    "goal": "Help with basic tasks",
-                    "tools": ["basic_tool"],
-                    "llm": "gpt-4.1-mini"
-                }],
-                "nodes": [{
-                    "name": "process_input",
-                    "description": "Process user input",
-                    "agent": "default_assistant"
-                }],
-                "edges": [{
-                    "source": "process_input",
-                    "target": "END",
-                    "condition": "task completed"
-                }]
-            }
-        elif framework == "react":
-            return {
-                "agents": [{
-                    "name": "default_assistant",
-                    "role": "General Assistant",
-                    "goal": "Help with basic tasks",
-                    "tools": ["basic_tool"],
-                    "llm": "gpt-4.1-mini"
-                }],
-                "tools": [{
-                    "name": "basic_tool",
-                    "description": "A basic utility tool",
-                    "parameters": {"input": "User input to process"}
-                }],
-                "examples": [...]
-            }
-        elif framework == "react-lcel":
-            return {
-                "agents": [{
-                    "name": "default_assistant",
-                    "role": "General A"
-                    "ssistant",
-                    "goal": "Help with multi-step tasks",
-                    "tools": ["basic_tool"],
-                    "llm": "llm"
-                }],
-                "tools": [{
-                    "name": "basic_tool",
-                    "description": "A basic utility tool",
-                    "parameters": {"input": "User input to process"},
-                    "examples": [{"input": "search cats", "output": "cat info"}]
-                }],
-                "examples": [{
-                    "query": "Find trending AI research papers",
-                    "thoughts": [
-                        "I should search for trending AI papers",
-                        "I should summarize the findings"
-                    ],
-                    "actions": [
-                        {"tool": "basic_tool", "input": "trending AI papers"}
-                    ],
-                    "observations": [
-                        "Found 3 relevant papers"
-                    ],
-                    "final_answer": "Here are the latest AI papers..."
-                }]
-            }
+        # Callers may modify the result (the CLI sets "process"), so it is a copy
+        return copy_config(_DEFAULT_CONFIGS.get(framework, {}))
 
-        else:
-            return {}
+    def _get_default_config_readonly(self, framework: str) -> Mapping[str, Any]:
+        """
+        Get the shared default configuration without copying it.
+
+        For callers that only read the config (e.g. to compare against it).
+        The returned mapping is read-only at the top level; nested values are
+        shared and must not be modified.
+
+        Args:
+            framework: The agent framework to use
+
+        Returns:
+            A read-only view of the default configuration
+        """
+        return _DEFAULT_CONFIG_VIEWS.get(framework, _EMPTY_CONFIG)
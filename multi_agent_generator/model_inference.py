@@ -1,20 +1,362 @@
 """
 Model inference utilities using LiteLLM for multiple providers.
 """
+import asyncio
+import functools
+import hashlib
+import inspect
+import itertools
+import json
+import logging
 import os
-from typing import Dict, List, Optional, Union
-from pydantic import BaseModel
-from dotenv import load_dotenv
-from litellm import completion  # Unified API
+import random
+import threading
+import time
+from types import MappingProxyType
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+)
+from pydantic import BaseModel, ConfigDict
+import litellm
+from litellm import acompletion, completion, get_supported_openai_params  # Unified API
 
-# Load environment variables
-load_dotenv()
+from .batching import RequestBatcher
+from .prompt_cache import SemanticCache
+from .response_cache import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+# Providers whose Batch API LiteLLM supports for chat completions, with the
+# URL of their chat completions endpoint in a batch input file
+_BATCH_ENDPOINTS = MappingProxyType({"openai": "/v1/chat/completions", "azure": "/chat/completions"})
+
+# Chat completion parameters a batch request body may carry; other request
+# arguments (LiteLLM or provider options like project_id) are rejected there
+_BATCH_BODY_ARGS = frozenset({
+    "frequency_penalty", "logit_bias", "logprobs", "max_completion_tokens", "max_tokens", "n",
+    "parallel_tool_calls", "presence_penalty", "response_format", "seed", "stop", "temperature",
+    "tool_choice", "tools", "top_logprobs", "top_p", "user",
+})
+
+# Batch states after which a batch makes no more progress
+_BATCH_DONE = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Request sent by ModelInference.prewarm
+_PING = ({"role": "user", "content": "ping"},)
+
+# Request arguments that do not change the completion, left out of the
+# semantic cache namespace
+_UNCACHED_ARGS = frozenset({"messages", "api_key", "api_base", "stream", "cache"})
+
+# LiteLLM cache controls of calls whose completion should not be reused
+_SKIP_LITELLM_CACHE = MappingProxyType({"no-cache": True, "no-store": True})
+
+# Provider credentials; a .env file is only read when none of these is set
+_CREDENTIAL_ENV_VARS = ("OPENAI_API_KEY", "WATSONX_API_KEY", "GEMINI_API_KEY", "GOOGLE_API_KEY", "API_KEY")
+_dotenv_checked = False
+
+
+def load_env_if_needed() -> None:
+    """Load environment variables from a .env file if no credentials are set."""
+    global _dotenv_checked
+    if _dotenv_checked:
+        return
+    _dotenv_checked = True
+    if any(os.getenv(name) for name in _CREDENTIAL_ENV_VARS):
+        return
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def _uses_explicit_prompt_cache(model: str) -> bool:
+    """
+    Whether the model only caches a prompt prefix marked with ``cache_control``.
+
+    Anthropic models (directly or via Bedrock/Vertex) need explicit markers;
+    OpenAI-style providers cache long prefixes automatically.
+    """
+    model = model.lower()
+    return model.startswith("anthropic/") or "claude" in model
+
+
+def _mark_cacheable(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a system message into a content block with an ephemeral cache marker."""
+    if message.get("role") != "system" or not isinstance(message.get("content"), str):
+        return message
+    return {
+        "role": "system",
+        "content": [{"type": "text", "text": message["content"], "cache_control": {"type": "ephemeral"}}],
+    }
+
+
+def _system_first(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Move system messages ahead of all others, keeping their relative order.
+
+    Provider prompt caches reuse the longest identical prefix of the request,
+    so the static instructions go first and the per-call content last.
+    """
+    seen_other = False
+    for message in messages:
+        if message.get("role") != "system":
+            seen_other = True
+        elif seen_other:
+            break
+    else:
+        return messages
+    return (
+        [m for m in messages if m.get("role") == "system"]
+        + [m for m in messages if m.get("role") != "system"]
+    )
+
+
+# Transient provider failures worth retrying (Timeout subclasses APIConnectionError)
+RETRYABLE_ERRORS = (
+    litellm.RateLimitError,
+    litellm.APIConnectionError,
+    litellm.ServiceUnavailableError,
+    litellm.InternalServerError,
+    TimeoutError,
+)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether ``error``, or the error it was raised from, is transient."""
+    while error is not None:
+        if isinstance(error, RETRYABLE_ERRORS):
+            return True
+        error = error.__cause__
+    return False
+
+
+# Attempts per provider call, unless a ModelInference is given retry_attempts
+DEFAULT_RETRY_ATTEMPTS = 3
+_RETRY_MAX_DELAY = 8.0
+
+_T = TypeVar("_T")
+
+
+def _retry_delay(attempt: int) -> float:
+    """Seconds to wait before retry ``attempt`` (1-based): exponential with up to 1s of jitter."""
+    return min(_RETRY_MAX_DELAY, 2.0 ** (attempt - 1)) + random.random()
+
+
+def _with_retries(attempts: int, call: Callable[..., _T], **kwargs: Any) -> _T:
+    """Run ``call``, retrying transient provider errors up to ``attempts`` calls in all."""
+    for attempt in range(1, attempts):
+        try:
+            return call(**kwargs)
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            logger.info("Retrying model call after transient error: %s", e)
+        time.sleep(_retry_delay(attempt))
+    return call(**kwargs)
+
+
+async def _awith_retries(attempts: int, call: Callable[..., Awaitable[_T]], **kwargs: Any) -> _T:
+    """Asynchronous version of ``_with_retries``."""
+    for attempt in range(1, attempts):
+        try:
+            return await call(**kwargs)
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            logger.info("Retrying model call after transient error: %s", e)
+        await asyncio.sleep(_retry_delay(attempt))
+    return await call(**kwargs)
+
+
+@functools.lru_cache(maxsize=32)
+def _supported_params(model: str) -> FrozenSet[str]:
+    """OpenAI-style parameters LiteLLM accepts for ``model``."""
+    try:
+        params = get_supported_openai_params(model=model)
+    except Exception:
+        return frozenset()
+    return frozenset(params or ())
+
+
+@functools.lru_cache(maxsize=32)
+def _supports_response_schema(model: str) -> bool:
+    """Whether ``model`` can be constrained to a JSON schema (``response_format=json_schema``)."""
+    try:
+        return bool(litellm.supports_response_schema(model=model))
+    except Exception:
+        return False
+
+
+def configure_http_pool(
+    max_connections: int = 1000,
+    max_keepalive_connections: int = 500,
+    keepalive_expiry: float = 120.0,
+    connect_timeout: float = 10.0,
+    timeout: float = 60.0,
+    http2: bool = True,
+) -> bool:
+    """
+    Send LiteLLM's requests through shared HTTP clients with large connection pools.
+
+    httpx's default pool (100 connections, 20 kept alive) makes concurrent
+    calls wait for a connection or handshake a new one; these clients keep
+    more connections open for longer. With HTTP/2, concurrent requests to
+    the same host are also multiplexed over a few connections. The clients
+    are kept for the life of the process, so call this once, before the
+    first request, from applications that run their async requests on one
+    long-lived event loop.
+
+    Args:
+        max_connections: Maximum open connections per client
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept open
+        connect_timeout: Seconds allowed to establish a connection
+        timeout: Seconds allowed for reading a response
+        http2: Use HTTP/2 when the ``h2`` package is installed
+            (``pip install multi-agent-generator[http2]``)
+
+    Returns:
+        Whether the clients use HTTP/2
+    """
+    import httpx
+
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            http2 = False
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    timeouts = httpx.Timeout(timeout, connect=connect_timeout)
+    litellm.client_session = httpx.Client(http2=http2, limits=limits, timeout=timeouts)
+    litellm.aclient_session = httpx.AsyncClient(http2=http2, limits=limits, timeout=timeouts)
+    return http2
+
+
+def enable_http2(max_connections: int = 200, max_keepalive_connections: int = 50) -> bool:
+    """
+    Send LiteLLM's requests through shared HTTP/2 clients (see ``configure_http_pool``).
+
+    Returns:
+        False, leaving LiteLLM's clients unchanged, if the ``h2`` package is
+        missing (``pip install multi-agent-generator[http2]``), else True
+    """
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return configure_http_pool(max_connections, max_keepalive_connections, connect_timeout=5.0)
+
+
+def configure_litellm_cache(cache_type: str = "redis", ttl: float = 3600.0, **cache_args) -> None:
+    """
+    Cache completions in LiteLLM's own cache, shared by every ModelInference.
+
+    LiteLLM then answers a repeated deterministic request (temperature 0)
+    from the cache instead of calling the provider; with a Redis, S3 or disk
+    cache the responses are shared between processes and survive restarts.
+    Other requests skip the cache. Called on import when ``LITELLM_CACHE=1``,
+    with ``LITELLM_CACHE_TYPE`` (default: redis),
+    ``LITELLM_CACHE_TTL`` (default: 3600) and, for Redis, ``REDIS_HOST``,
+    ``REDIS_PORT`` and ``REDIS_PASSWORD``.
+
+    Args:
+        cache_type: LiteLLM cache type ("local", "redis", "disk", "s3", ...)
+        ttl: Seconds a response is kept
+        **cache_args: Further ``litellm.caching.Cache`` arguments, e.g. host and port
+    """
+    from litellm.caching import Cache
+
+    litellm.cache = Cache(type=cache_type, ttl=ttl, **cache_args)
+
+
+def _env_number(name: str, default: Union[int, float], convert: Callable[[str], Any]) -> Any:
+    """``convert`` of an environment variable; ``default`` (with a warning) if unset or malformed."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return convert(value)
+    except ValueError:
+        logger.warning("Ignoring %s=%r: not a number; using %s", name, value, default)
+        return default
+
+
+def _configure_litellm_cache_from_env() -> None:
+    cache_type = os.getenv("LITELLM_CACHE_TYPE", "redis")
+    cache_args: Dict[str, Any] = {}
+    if cache_type == "redis":
+        cache_args = {
+            "host": os.getenv("REDIS_HOST"),
+            "port": _env_number("REDIS_PORT", 6379, int),
+            "password": os.getenv("REDIS_PASSWORD"),
+        }
+    configure_litellm_cache(cache_type, _env_number("LITELLM_CACHE_TTL", 3600.0, float), **cache_args)
+
+
+# Runs on import, so a broken setting is logged rather than raised
+if os.getenv("LITELLM_CACHE", "0") == "1":
+    _configure_litellm_cache_from_env()
+
+
+def _frozen(value: Any) -> Any:
+    """``value`` with lists turned into tuples so it can be part of a cache key."""
+    return tuple(value) if isinstance(value, list) else value
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_model(
+    model: str, api_key: Any, api_base: Any, params: Tuple[Tuple[str, Any], ...]
+) -> "ModelInference":
+    return ModelInference(model, api_key, api_base, **dict(params))
+
+
+def create_model_inference(
+    model: str,
+    api_key: Union[None, str, Sequence[str]] = None,
+    api_base: Union[None, str, Sequence[str]] = None,
+    **default_params
+) -> "ModelInference":
+    """
+    Return a ModelInference for these settings, shared by all callers passing the same ones.
+
+    Building one resolves credentials and looks up the model's capabilities,
+    and every instance adds its own entries to LiteLLM's client cache;
+    applications that create models per request or per UI rerun reuse one
+    instead. Settings that cannot be hashed (e.g. dict parameters) get a new
+    instance each time.
+
+    Args:
+        model: LiteLLM model name
+        api_key: API key, or keys used in turn (see ``ModelInference``)
+        api_base: Endpoint, or endpoints used in turn
+        **default_params: Completion parameters and other ``ModelInference`` options
+    """
+    params = tuple(sorted((name, _frozen(value)) for name, value in default_params.items()))
+    try:
+        return _cached_model(model, _frozen(api_key), _frozen(api_base), params)
+    except TypeError:  # unhashable setting
+        return ModelInference(model, api_key, api_base, **default_params)
+
+
+def clear_model_cache() -> None:
+    """Forget the instances shared by ``create_model_inference``."""
+    _cached_model.cache_clear()
 
 
 class Message(BaseModel):
+    # Immutable, so one instance (e.g. a system prompt) can be shared by all requests
+    model_config = ConfigDict(frozen=True)
+
     role: str
     content: str
 
+    def as_dict(self) -> Dict[str, str]:
+        """The message as a LiteLLM message dict, built without pydantic's serializer."""
+        return {"role": self.role, "content": self.content}
+
 
 class ModelInference:
     """
@@ -25,14 +367,76 @@ class ModelInference:
     def __init__(
         self,
         model: str,
-        api_key: Optional[str] = None,
-        api_base: Optional[str] = None,
+        api_key: Union[None, str, Sequence[str]] = None,
+        api_base: Union[None, str, Sequence[str]] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        response_cache: Optional[CacheBackend] = None,
+        batcher: Optional[RequestBatcher] = None,
+        retry_attempts: int = DEFAULT_RETRY_ATTEMPTS,
         **default_params
     ):
+        """
+        Args:
+            model: LiteLLM model name
+            api_key: Provider API key (default: looked up from the environment),
+                or several keys used in turn, one per request
+            api_base: Provider endpoint (default: API_BASE), or several (e.g.
+                regions) used in turn; a list of endpoints and a list of keys
+                are paired up in order
+            semantic_cache: If given, a call whose last message is similar to
+                one answered before with the same model, earlier messages and
+                parameters returns that answer without a request
+            response_cache: If given, deterministic calls (temperature 0, not
+                streamed) identical to an earlier one return its response;
+                hits and misses are counted in ``cache_stats``
+            batcher: If given, async calls are started through it, e.g. to
+                stay within the provider's rate limit
+            retry_attempts: Calls made per request when the provider fails
+                transiently (rate limits, timeouts, 5xx), with exponential
+                backoff between them; 1 disables retries
+            **default_params: Completion parameters sent with every call
+
+        Raises:
+            ValueError: If a list of keys or endpoints is empty, or both are
+                lists of different lengths
+        """
+        load_env_if_needed()
         self.model = model
-        self.api_key = api_key or self._get_api_key_for_model(model)
-        self.api_base = api_base or os.getenv("API_BASE")
-        self.default_params = default_params
+        keys = [api_key] if api_key is None or isinstance(api_key, str) else list(api_key)
+        bases = [api_base] if api_base is None or isinstance(api_base, str) else list(api_base)
+        if not keys or not bases:
+            raise ValueError("api_key and api_base lists must not be empty")
+        if len(keys) > 1 and len(bases) > 1 and len(keys) != len(bases):
+            raise ValueError("api_key and api_base lists must have the same length")
+        keys = [key or self._get_api_key_for_model(model) for key in keys]
+        bases = [base or os.getenv("API_BASE") for base in bases]
+        if len(keys) == 1:
+            keys = keys * len(bases)
+        elif len(bases) == 1:
+            bases = bases * len(keys)
+        # (api_key, api_base) pairs, taken round-robin by each request
+        self.endpoints: Tuple[Tuple[Optional[str], Optional[str]], ...] = tuple(zip(keys, bases))
+        self.api_key, self.api_base = self.endpoints[0]
+        # Read-only: the merged request arguments below are built from it
+        self.default_params = MappingProxyType(default_params)
+        # Arguments shared by every request to each endpoint, merged once;
+        # taken round-robin by _request
+        self._next_base_kwargs = itertools.cycle([
+            {"model": model, "api_key": key, "api_base": base, **default_params} for key, base in self.endpoints
+        ]).__next__
+        self.semantic_cache = semantic_cache
+        self.response_cache = response_cache
+        self.batcher = batcher
+        self.retry_attempts = retry_attempts
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self.cache_markers = _uses_explicit_prompt_cache(model)
+        self.supported_params = _supported_params(model)
+        # Provider can be asked for a bare JSON object (response_format=json_object)
+        self.json_mode = "response_format" in self.supported_params
+        # ... or for an object matching a JSON schema
+        self.schema_mode = self.json_mode and _supports_response_schema(model)
+        # Token usage of the last call, including prompt tokens read from the provider cache
+        self.last_usage: Optional[Dict[str, int]] = None
 
     def _get_api_key_for_model(self, model: str) -> Optional[str]:
         """Get the appropriate API key based on the model name."""
@@ -53,17 +457,363 @@ class ModelInference:
     ) -> str:
         """
         Synchronously generate text.
+
+        System messages are sent with a ``cache_control`` marker for providers
+        that need one, so the static system prompt is served from the
+        provider's prompt cache on repeated calls.
         """
+        request = self._request(messages, override_params)
+        key, slot, cached = self._cache_lookup(request)
+        if cached is not None:
+            return cached
         try:
-            msg_list = [m.dict() if isinstance(m, Message) else m for m in messages]
-            response = completion(
-                model=self.model,
-                messages=msg_list,
-                api_key=self.api_key,
-                api_base=self.api_base,
-                **{**self.default_params, **override_params}
-            )
-            return response.choices[0].message.content
+            response = self._completion(request)
+            self.last_usage = self._usage_of(response)
+            text = response.choices[0].message.content
+
+        except Exception as e:
+            raise RuntimeError(f"Model inference failed: {e}") from e
+        self._cache_store(key, slot, text)
+        return text
+
+    def generate_text_stream(
+        self,
+        messages: List[Union[Dict, Message]],
+        **override_params
+    ) -> Iterator[str]:
+        """
+        Synchronously generate text, yielding content chunks as they arrive.
+
+        Closing the iterator early (e.g. ``break`` in the consuming loop)
+        stops reading the response. A semantic cache hit is yielded as a single
+        chunk; only responses read to the end are stored.
+        """
+        request = self._request(messages, {**override_params, "stream": True})
+        _, slot, cached = self._cache_lookup(request)
+        if cached is not None:
+            yield cached
+            return
+        try:
+            response = self._completion(request)
+        except Exception as e:
+            raise RuntimeError(f"Model inference failed: {e}") from e
+
+        parts: List[str] = []
+        try:
+            for chunk in response:
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content:
+                    if slot is not None:
+                        parts.append(content)
+                    yield content
+            self._cache_store(None, slot, "".join(parts))
+        except Exception as e:
+            raise RuntimeError(f"Model inference failed: {e}") from e
+        finally:
+            # Release the underlying HTTP stream when the consumer stops early
+            close = getattr(getattr(response, "completion_stream", None), "close", None)
+            if close is not None:
+                close()
+
+    async def agenerate_text(
+        self,
+        messages: List[Union[Dict, Message]],
+        **override_params
+    ) -> str:
+        """
+        Asynchronously generate text; same behaviour as ``generate_text``.
+
+        LiteLLM reuses its async HTTP client across calls, so concurrent
+        requests share connections.
+        """
+        request = self._request(messages, override_params)
+        key, slot, cached = self._cache_lookup(request)
+        if cached is not None:
+            return cached
+        try:
+            response = await self._acompletion(request)
+            self.last_usage = self._usage_of(response)
+            text = response.choices[0].message.content
+
+        except Exception as e:
+            raise RuntimeError(f"Model inference failed: {e}") from e
+        self._cache_store(key, slot, text)
+        return text
+
+    async def agenerate_text_stream(
+        self,
+        messages: List[Union[Dict, Message]],
+        **override_params
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronously generate text, yielding content chunks as they arrive.
+
+        Same behaviour as ``generate_text_stream``; closing the iterator early
+        (``aclose()``, or leaving an ``async for`` loop) stops reading the response.
+        """
+        request = self._request(messages, {**override_params, "stream": True})
+        _, slot, cached = self._cache_lookup(request)
+        if cached is not None:
+            yield cached
+            return
+        try:
+            response = await self._acompletion(request)
+        except Exception as e:
+            raise RuntimeError(f"Model inference failed: {e}") from e
+
+        parts: List[str] = []
+        try:
+            async for chunk in response:
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content:
+                    if slot is not None:
+                        parts.append(content)
+                    yield content
+            self._cache_store(None, slot, "".join(parts))
+        except Exception as e:
+            raise RuntimeError(f"Model inference failed: {e}") from e
+        finally:
+            # Release the underlying HTTP stream when the consumer stops early
+            stream = getattr(response, "completion_stream", None)
+            close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+            if close is not None:
+                closed = close()
+                if inspect.isawaitable(closed):
+                    await closed
+
+    async def generate_many(
+        self,
+        prompts: Sequence[Union[str, List[Union[Dict, Message]]]],
+        concurrency: int = 32,
+        **override_params
+    ) -> List[str]:
+        """
+        Generate a completion for each prompt, with up to ``concurrency`` requests in flight.
+
+        Args:
+            prompts: User prompts, or full message lists
+            concurrency: Maximum number of concurrent requests
+            **override_params: Completion parameters for every call
+
+        Returns:
+            The completions, in the same order as ``prompts``
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate_one(prompt: Union[str, List[Union[Dict, Message]]]) -> str:
+            messages = [{"role": "user", "content": prompt}] if isinstance(prompt, str) else prompt
+            async with semaphore:
+                return await self.agenerate_text(messages, **override_params)
+
+        return list(await asyncio.gather(*(generate_one(p) for p in prompts)))
+
+    def generate_batch(
+        self,
+        prompts: Sequence[Union[str, List[Union[Dict, Message]]]],
+        poll_interval: float = 10.0,
+        timeout: Optional[float] = None,
+        **override_params
+    ) -> List[Optional[str]]:
+        """
+        Generate a completion for each prompt through the provider's Batch API.
+
+        Batched requests are billed at a discount and do not count against the
+        per-request rate limits, but the provider may take up to 24 hours to
+        run them, so this suits offline workloads. Only OpenAI and Azure
+        models are supported.
 
+        Args:
+            prompts: User prompts, or full message lists
+            poll_interval: Seconds between checks of the batch status
+            timeout: Seconds to wait for the batch (default: no limit)
+            **override_params: Completion parameters for every request
+
+        Returns:
+            The completions, in the same order as ``prompts``; None for
+            requests that failed
+
+        Raises:
+            ValueError: If the model's provider has no supported Batch API
+            RuntimeError: If the batch fails or does not finish within ``timeout``
+        """
+        model, provider, _, _ = litellm.get_llm_provider(self.model)
+        url = _BATCH_ENDPOINTS.get(provider)
+        if url is None:
+            raise ValueError(f"Batch API not supported for provider '{provider}'")
+        # The input file, the batch and its results all live on one endpoint;
+        # successive batches take the endpoints in turn
+        base = self._next_base_kwargs()
+        credentials = {"custom_llm_provider": provider, "api_key": base["api_key"], "api_base": base["api_base"]}
+        lines = self._batch_lines(prompts, model, url, override_params)
+
+        try:
+            input_file = litellm.create_file(file=("\n".join(lines) + "\n").encode(), purpose="batch", **credentials)
+            batch = litellm.create_batch(
+                completion_window="24h", endpoint=url, input_file_id=input_file.id, **credentials
+            )
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while batch.status not in _BATCH_DONE:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"batch {batch.id} did not finish within {timeout:g}s")
+                time.sleep(poll_interval)
+                batch = litellm.retrieve_batch(batch_id=batch.id, **credentials)
+            # Expired batches still return the requests that completed
+            if batch.status not in ("completed", "expired") or not batch.output_file_id:
+                raise RuntimeError(f"batch {batch.id} {batch.status}")
+            output = litellm.file_content(file_id=batch.output_file_id, **credentials)
         except Exception as e:
-            raise RuntimeError(f"Model inference failed: {e}")
+            raise RuntimeError(f"Model inference failed: {e}") from e
+
+        results: List[Optional[str]] = [None] * len(prompts)
+        for line in output.text.splitlines():
+            if not line:
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                results[int(record["custom_id"])] = response["body"]["choices"][0]["message"]["content"]
+        return results
+
+    def _batch_lines(
+        self,
+        prompts: Sequence[Union[str, List[Union[Dict, Message]]]],
+        model: str,
+        url: str,
+        override_params: Dict[str, Any],
+    ) -> List[str]:
+        """
+        Build the JSONL lines of a batch input file, one request per prompt.
+
+        ``model`` is the provider's model name (for Azure, the deployment).
+        Only chat completion parameters that are set go into the bodies.
+        """
+        lines = []
+        for i, prompt in enumerate(prompts):
+            messages = [{"role": "user", "content": prompt}] if isinstance(prompt, str) else prompt
+            request = self._request(messages, override_params)
+            body = {k: v for k, v in request.items() if k in _BATCH_BODY_ARGS and v is not None}
+            body.update(model=model, messages=request["messages"])
+            lines.append(json.dumps({"custom_id": str(i), "method": "POST", "url": url, "body": body}))
+        return lines
+
+    def prewarm(self, connections: int = 1, wait: bool = False) -> None:
+        """
+        Open connections to the provider ahead of the first real request.
+
+        Sends ``connections`` concurrent one-token requests from background
+        threads, so DNS lookup, TCP and TLS handshakes and authentication
+        are done and the connections stay in the HTTP client's keep-alive
+        pool. The requests bypass the response caches; failures are only
+        logged.
+
+        Args:
+            connections: Number of concurrent requests (connections to open)
+            wait: Block until the requests have completed
+        """
+        def ping() -> None:
+            try:
+                request = self._request(list(_PING), {"max_tokens": 1})
+                if litellm.cache is not None:
+                    request["cache"] = dict(_SKIP_LITELLM_CACHE)
+                completion(**request)
+            except Exception as e:
+                logger.debug("Prewarm request to %s failed: %s", self.model, e)
+
+        threads = [threading.Thread(target=ping, daemon=True) for _ in range(connections)]
+        for thread in threads:
+            thread.start()
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _completion(self, request: Dict[str, Any]):
+        # Retries go through LiteLLM's shared HTTP client, reusing its pooled connections
+        return _with_retries(self.retry_attempts, completion, **request)
+
+    async def _acompletion(self, request: Dict[str, Any]):
+        if self.batcher is None:
+            return await _awith_retries(self.retry_attempts, acompletion, **request)
+        # Each attempt is queued again, so retries also respect the rate limit
+        submit = functools.partial(self.batcher.submit, functools.partial(acompletion, **request))
+        return await _awith_retries(self.retry_attempts, submit)
+
+    def _request(self, messages: List[Union[Dict, Message]], override_params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the keyword arguments of a LiteLLM completion call.
+
+        System messages are always sent first (see ``_system_first``); for
+        providers that need a marker, the last of them carries it, which
+        caches the whole system prefix with a single breakpoint. When a
+        LiteLLM cache is configured, only deterministic calls (temperature
+        0) use it.
+        """
+        msg_list = _system_first([m.as_dict() if isinstance(m, Message) else m for m in messages])
+        if self.cache_markers:
+            last_system = next((i for i in range(len(msg_list) - 1, -1, -1) if msg_list[i].get("role") == "system"), None)
+            if last_system is not None:
+                msg_list[last_system] = _mark_cacheable(msg_list[last_system])
+        base = self._next_base_kwargs()
+        request = {**base, **override_params} if override_params else base.copy()
+        request["messages"] = msg_list
+        if litellm.cache is not None and request.get("temperature", 1) != 0:
+            request["cache"] = dict(_SKIP_LITELLM_CACHE)
+        return request
+
+    def _cache_lookup(
+        self, request: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[Tuple[str, str]], Optional[str]]:
+        """
+        Return the response cache key and semantic cache slot of ``request``, and a cached response.
+
+        The key is the SHA-256 digest of the request; it is None when there is
+        no response cache or the call is not deterministic. The slot is
+        ``(prompt, namespace)``: the text of the last message and a digest of
+        everything else that shapes the completion; it is None when there is
+        no semantic cache or the last message is not plain text.
+        """
+        key = slot = None
+        context = {k: v for k, v in request.items() if k not in _UNCACHED_ARGS}
+        if self.response_cache is not None and not request.get("stream") and request.get("temperature", 1) == 0:
+            canonical = json.dumps({**context, "messages": request["messages"]}, sort_keys=True, default=str)
+            key = hashlib.sha256(canonical.encode()).hexdigest()
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                self.cache_stats["hits"] += 1
+                return key, slot, cached
+            self.cache_stats["misses"] += 1
+
+        messages = request["messages"]
+        prompt = messages[-1].get("content") if messages else None
+        if self.semantic_cache is not None and isinstance(prompt, str):
+            context["messages"] = messages[:-1]
+            canonical = json.dumps(context, sort_keys=True, default=str).encode()
+            slot = (prompt, hashlib.blake2b(canonical, digest_size=16).hexdigest())
+            cached = self.semantic_cache.get(*slot)
+            if isinstance(cached, str):
+                return key, slot, cached
+        return key, slot, None
+
+    def _cache_store(self, key: Optional[str], slot: Optional[Tuple[str, str]], text: Optional[str]) -> None:
+        """Store a completed response under the key and slot from ``_cache_lookup``."""
+        if not text:
+            return
+        if key is not None:
+            self.response_cache.set(key, text)
+        if slot is not None:
+            self.semantic_cache.put(slot[0], slot[1], text)
+
+    @staticmethod
+    def _usage_of(response) -> Optional[Dict[str, int]]:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return None
+        # Anthropic reports cache reads directly; OpenAI under prompt_tokens_details
+        cached = getattr(usage, "cache_read_input_tokens", None)
+        if cached is None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached = getattr(details, "cached_tokens", None)
+        return {
+            "prompt_tokens": usage.prompt_tokens or 0,
+            "completion_tokens": usage.completion_tokens or 0,
+            "cache_read_input_tokens": cached or 0,
+        }
@@ -0,0 +1,199 @@
+"""
+Semantic cache for prompt analysis results.
+
+Near-duplicate prompts ("build a research crew" / "make me a research team")
+usually produce the same agent configuration. ``SemanticCache`` embeds each
+prompt and reuses a stored configuration when the cosine similarity to a
+previously analyzed prompt exceeds a threshold, skipping the LLM call.
+
+Requires the optional ``numpy`` and ``sentence-transformers`` packages
+(``pip install multi-agent-generator[semantic]``).
+"""
+import base64
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from ._fast import prompt_fingerprint
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "multi_agent_generator", "semantic")
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_THRESHOLD = 0.92
+
+# Embeddings of prompts that just missed, kept for storing their results
+_RECENT_EMBEDDINGS = 32
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache for configurations keyed by prompt.
+
+    Entries are appended to ``entries.jsonl``, one line each holding the
+    namespace, prompt, fingerprint and configuration with the prompt's
+    embedding (a base64 float32 unit vector), so storing an entry writes only
+    that line. On load the embeddings are stacked into an ``(N, D)`` matrix.
+    A prompt whose normalized fingerprint is already stored is answered
+    without embedding it; otherwise a lookup is a single matrix-vector product.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        threshold: float = DEFAULT_THRESHOLD,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+    ):
+        """
+        Args:
+            directory: Where the entries are stored
+            threshold: Minimum cosine similarity for a cache hit
+            model_name: sentence-transformers model used to embed prompts
+        """
+        self.directory = directory
+        self.threshold = threshold
+        self.model_name = model_name
+        self._encoder = None
+        # Embedding rows; only the first len(self._entries) are in use, the
+        # rest is room to append to without copying the matrix every time
+        self._matrix = None
+        self._entries: Optional[List[Dict[str, Any]]] = None
+        self._by_key: Dict[str, int] = {}
+        self._recent: "OrderedDict[str, Any]" = OrderedDict()
+        # The file ends in a partial line, which the next entry must not extend
+        self._partial_line = False
+
+    @staticmethod
+    def available() -> bool:
+        """Return True if the optional embedding dependencies are installed."""
+        try:
+            import numpy  # noqa: F401
+            import sentence_transformers  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @staticmethod
+    def key(prompt: str, namespace: str) -> str:
+        """Exact-match fingerprint of ``prompt`` within ``namespace``."""
+        return prompt_fingerprint(prompt, namespace)
+
+    @property
+    def _entries_path(self) -> str:
+        return os.path.join(self.directory, "entries.jsonl")
+
+    def _embed(self, prompt: str):
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+            self._encoder = SentenceTransformer(self.model_name)
+        return self._encoder.encode(prompt, normalize_embeddings=True).astype("float32")
+
+    def _load(self) -> None:
+        if self._entries is not None:
+            return
+        import numpy as np
+
+        entries: List[Dict[str, Any]] = []
+        rows = []
+        try:
+            with open(self._entries_path, "rb") as f:
+                for line in f:
+                    self._partial_line = not line.endswith(b"\n")
+                    try:
+                        entry = json.loads(line)
+                        row = np.frombuffer(base64.b64decode(entry.pop("embedding")), dtype=np.float32)
+                    except (ValueError, TypeError, KeyError, AttributeError):
+                        # e.g. a line cut short by a crash
+                        continue
+                    if rows and len(row) != len(rows[0]):
+                        continue
+                    entries.append(entry)
+                    rows.append(row)
+        except OSError:
+            pass
+        self._entries = entries
+        self._matrix = np.stack(rows) if rows else None
+        self._by_key = {e["key"]: i for i, e in enumerate(entries) if "key" in e}
+
+    def get(self, prompt: str, namespace: str, threshold: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a configuration for a prompt similar to ``prompt``.
+
+        Args:
+            prompt: The natural language description
+            namespace: Only entries stored under the same namespace match
+                (e.g. provider, framework and model)
+            threshold: Minimum cosine similarity for this lookup
+                (default: the cache's ``threshold``)
+
+        Returns:
+            The cached configuration, or None on a miss
+        """
+        import numpy as np
+
+        self._load()
+        if not self._entries:
+            return None
+
+        exact = self._by_key.get(self.key(prompt, namespace))
+        if exact is not None:
+            return self._entries[exact]["config"]
+
+        embedding = self._embed(prompt)
+        count = len(self._entries)
+        scores = self._matrix[:count] @ embedding
+        mask = np.fromiter((e["namespace"] == namespace for e in self._entries), dtype=bool, count=count)
+        if mask.any():
+            scores = np.where(mask, scores, -np.inf)
+            best = int(np.argmax(scores))
+            if scores[best] >= (self.threshold if threshold is None else threshold):
+                return self._entries[best]["config"]
+        # Kept so storing the result of this miss does not embed the prompt again
+        self._recent[prompt] = embedding
+        if len(self._recent) > _RECENT_EMBEDDINGS:
+            self._recent.popitem(last=False)
+        return None
+
+    def put(self, prompt: str, namespace: str, config: Dict[str, Any], embedding=None) -> None:
+        """
+        Store a configuration for ``prompt``.
+
+        Args:
+            prompt: The natural language description
+            namespace: Namespace the entry belongs to
+            config: The configuration produced for the prompt
+            embedding: The prompt's embedding, if already computed (default:
+                the one from a preceding missed ``get``, else computed here)
+        """
+        import numpy as np
+
+        self._load()
+        if embedding is None:
+            embedding = self._recent.pop(prompt, None)
+        if embedding is None:
+            embedding = self._embed(prompt)
+        key = self.key(prompt, namespace)
+        entry = {"namespace": namespace, "prompt": prompt, "key": key, "config": config}
+        line = json.dumps({**entry, "embedding": base64.b64encode(embedding.tobytes()).decode("ascii")}) + "\n"
+        if self._partial_line:
+            line = "\n" + line
+            self._partial_line = False
+
+        os.makedirs(self.directory, exist_ok=True)
+        # A single append per entry, so lines from concurrent processes are
+        # not interleaved and earlier entries are never rewritten
+        fd = os.open(self._entries_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+        count = len(self._entries)
+        if self._matrix is None or count == len(self._matrix):
+            # Double the capacity, so appending N entries copies O(N) rows in all
+            grown = np.empty((max(16, 2 * count), len(embedding)), dtype=np.float32)
+            if count:
+                grown[:count] = self._matrix[:count]
+            self._matrix = grown
+        self._matrix[count] = embedding
+        self._entries.append(entry)
+        self._by_key[key] = count
@@ -0,0 +1,56 @@
+"""
+Exact-match cache for model completions.
+
+``ModelInference`` looks up deterministic calls (temperature 0, not
+streamed) by a SHA-256 digest of the whole request before sending them, so
+a repeated request never reaches the provider. Any object with ``get`` and
+``set`` can serve as the backend; ``MemoryBackend`` keeps the most recently
+used responses in process.
+"""
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class CacheBackend(Protocol):
+    """Storage for cached completions, keyed by request digest."""
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the response stored under ``key``, or None."""
+        ...
+
+    def set(self, key: str, value: str) -> None:
+        """Store ``value`` under ``key``."""
+        ...
+
+
+class MemoryBackend:
+    """In-process cache evicting the least recently used response."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            max_entries: Responses kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
@@ -0,0 +1,85 @@
+"""
+Keyword routing of prompts to an agent framework.
+
+``FrameworkRouter`` picks a framework for prompts that do not name one
+(``framework="auto"``). All keywords are compiled into one alternation, so
+each prompt is scanned once by the regex engine instead of testing every
+keyword with a separate substring search.
+"""
+import re
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Tuple
+
+class Framework(str, Enum):
+    """
+    Names of the built-in frameworks.
+
+    Members are strings equal to their value, so they can be passed wherever
+    a framework name is expected; frameworks added with ``register_framework``
+    are passed as plain strings.
+    """
+    CREWAI = "crewai"
+    CREWAI_FLOW = "crewai-flow"
+    LANGGRAPH = "langgraph"
+    REACT = "react"
+    REACT_LCEL = "react-lcel"
+
+    # Format as the bare name, also in f-strings (used in cache keys)
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+# Keyword -> framework, in priority order: when a prompt mentions several
+# frameworks, the one listed first wins (e.g. "crewai flow" -> crewai-flow)
+DEFAULT_ROUTES: Tuple[Tuple[str, str], ...] = (
+    ("lcel", "react-lcel"),
+    ("flow", "crewai-flow"),
+    ("langgraph", "langgraph"),
+    ("graph", "langgraph"),
+    ("react", "react"),
+    ("crewai", "crewai"),
+    ("crew", "crewai"),
+)
+
+DEFAULT_FRAMEWORK = "crewai"
+
+
+class FrameworkRouter:
+    """Choose a framework for a prompt from the keywords it mentions."""
+
+    def __init__(
+        self,
+        routes: Sequence[Tuple[str, str]] = DEFAULT_ROUTES,
+        default: str = DEFAULT_FRAMEWORK,
+    ):
+        """
+        Args:
+            routes: ``(keyword, framework)`` pairs in priority order; keywords
+                match whole words, case-insensitively
+            default: Framework used when no keyword matches
+        """
+        self.default = default
+        self._rank: Dict[str, int] = {}
+        self._framework: Dict[str, str] = {}
+        for keyword, framework in routes:
+            keyword = keyword.lower()
+            self._rank.setdefault(keyword, len(self._rank))
+            self._framework.setdefault(keyword, framework)
+        # Longer keywords first so "langgraph" is not matched as "graph"
+        alternation = "|".join(re.escape(k) for k in sorted(self._rank, key=len, reverse=True))
+        self._pattern = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+    def route_one(self, prompt: str) -> str:
+        """Return the framework for ``prompt``."""
+        best: Optional[str] = None
+        for match in self._pattern.finditer(prompt):
+            keyword = match.group().lower()
+            if best is None or self._rank[keyword] < self._rank[best]:
+                best = keyword
+                if self._rank[best] == 0:
+                    break
+        return self.default if best is None else self._framework[best]
+
+    def route(self, prompts: Sequence[str]) -> List[str]:
+        """Return the framework for each of ``prompts``, in order."""
+        return [self.route_one(prompt) for prompt in prompts]
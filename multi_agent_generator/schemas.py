@@ -0,0 +1,157 @@
+"""
+JSON schemas of the configurations each framework's code generator reads.
+
+The schemas only require what the generators index directly (names, the
+fields interpolated into the code), so a config that passes can always be
+turned into code; optional fields are filled with defaults later.
+
+``normalize_config`` checks a parsed response and copies it in the same walk
+over the data, for the subset of JSON Schema used here; ``AgentGenerator``
+stores that copy in its caches. ``validator_for`` compiles a schema with
+``fastjsonschema`` when it is installed (``pip install
+multi-agent-generator[fast]``), for validating configs built elsewhere.
+Either way an invalid config raises a ``ValueError``. ``response_format_for``
+wraps a schema for providers that constrain their output to one.
+"""
+import functools
+from typing import Any, Callable, Dict, Optional
+
+_NAMED_OBJECT = {"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}}
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+_CREWAI_SCHEMA = {
+    "type": "object",
+    "required": ["agents", "tasks"],
+    "properties": {
+        "agents": {"type": "array", "items": _NAMED_OBJECT},
+        "tasks": {"type": "array", "items": _NAMED_OBJECT},
+    },
+}
+
+_LANGGRAPH_SCHEMA = {
+    "type": "object",
+    "required": ["agents", "nodes", "edges"],
+    "properties": {
+        "agents": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "role", "llm", "tools"],
+                "properties": {
+                    "name": {"type": "string"},
+                    "role": {"type": "string"},
+                    "llm": {"type": "string"},
+                    "tools": _STRING_LIST,
+                },
+            },
+        },
+        "nodes": {
+            "type": "array",
+            "items": {"type": "object", "required": ["name", "agent"]},
+        },
+        "edges": {
+            "type": "array",
+            "items": {"type": "object", "required": ["source", "target"]},
+        },
+    },
+}
+
+_REACT_SCHEMA = {
+    "type": "object",
+    "required": ["agents"],
+    "properties": {
+        "agents": {
+            "type": "array",
+            "items": {"type": "object", "required": ["role", "goal"]},
+        },
+        "tools": {"type": "array", "items": _NAMED_OBJECT},
+    },
+}
+
+CONFIG_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "crewai": _CREWAI_SCHEMA,
+    "crewai-flow": _CREWAI_SCHEMA,
+    "langgraph": _LANGGRAPH_SCHEMA,
+    "react": _REACT_SCHEMA,
+    "react-lcel": _REACT_SCHEMA,
+}
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+}
+
+_NO_SCHEMA: Dict[str, Any] = {}
+
+
+def _copy_checked(schema: Dict[str, Any], value: Any, path: str) -> Any:
+    """Validate ``value`` against ``schema`` while building a copy of it, in one walk."""
+    expected = schema.get("type")
+    if expected is not None and not isinstance(value, _JSON_TYPES[expected]):
+        raise ValueError(f"{path} must be {expected}")
+    if isinstance(value, dict):
+        for key in schema.get("required", ()):
+            if key not in value:
+                raise ValueError(f"{path} must contain {key}")
+        properties = schema.get("properties", _NO_SCHEMA)
+        return {
+            key: _copy_checked(properties.get(key, _NO_SCHEMA), item, f"{path}.{key}")
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        items = schema.get("items", _NO_SCHEMA)
+        return [_copy_checked(items, item, f"{path}[{i}]") for i, item in enumerate(value)]
+    return value
+
+
+def copy_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a JSON-compatible config; cheaper than ``copy.deepcopy``."""
+    return _copy_checked(_NO_SCHEMA, config, "data")
+
+
+def normalize_config(framework: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a validated copy of ``config``, built in a single pass.
+
+    Frameworks without a schema are copied unchecked.
+
+    Raises:
+        ValueError: If ``config`` does not match the framework's schema
+    """
+    return _copy_checked(CONFIG_SCHEMAS.get(framework, _NO_SCHEMA), config, "data")
+
+
+@functools.lru_cache(maxsize=None)
+def validator_for(framework: str) -> Optional[Callable[[Any], Any]]:
+    """
+    Return the validator of ``framework``'s configs, or None if it has no schema.
+
+    The validator raises ``ValueError`` for an invalid config.
+    """
+    schema = CONFIG_SCHEMAS.get(framework)
+    if schema is None:
+        return None
+    try:
+        import fastjsonschema
+    except ImportError:
+        return lambda config: _copy_checked(schema, config, "data")
+    return fastjsonschema.compile(schema)
+
+
+@functools.lru_cache(maxsize=None)
+def response_format_for(framework: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the ``response_format`` asking for a config matching ``framework``'s schema.
+
+    None if the framework has no schema. The schema is not sent in strict
+    mode, which would require every property to be listed and required.
+    """
+    schema = CONFIG_SCHEMAS.get(framework)
+    if schema is None:
+        return None
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": f"{framework.replace('-', '_')}_config", "schema": schema},
+    }
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import os
+import time
+
+# Use LiteLLM's bundled model list instead of fetching it on import
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+import litellm
+import pytest
+
+from multi_agent_generator import model_inference
+from multi_agent_generator.generator import AgentGenerator
+
+CREWAI_CONFIG = {
+    "agents": [{"name": "researcher", "role": "Research Specialist"}],
+    "tasks": [{"name": "research", "description": "Research the topic", "agent": "researcher"}],
+}
+
+
+class FakeLLM:
+    """
+    Stand-in for LiteLLM's completion functions.
+
+    Records the keyword arguments of every call and answers with ``reply``
+    (LiteLLM's mock responses, so streaming works as with a provider).
+    ``errors`` are raised, in order, by the first calls.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.errors = []
+        self.reply = json.dumps(CREWAI_CONFIG)
+        self.delay = 0.0
+
+    def _respond(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.errors:
+            raise self.errors.pop(0)
+        reply = self.reply(kwargs) if callable(self.reply) else self.reply
+        return litellm.completion(
+            model=kwargs["model"], messages=kwargs["messages"], stream=kwargs.get("stream", False),
+            mock_response=reply,
+        )
+
+    def completion(self, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        return self._respond(**kwargs)
+
+    async def acompletion(self, **kwargs):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self._respond(**kwargs)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    for name in ("DEFAULT_MODEL", "API_BASE", "AGENT_SOFT_TIMEOUT", "LITELLM_CACHE"):
+        monkeypatch.delenv(name, raising=False)
+    llm = FakeLLM()
+    monkeypatch.setattr(model_inference, "completion", llm.completion)
+    monkeypatch.setattr(model_inference, "acompletion", llm.acompletion)
+    # No backoff between retries
+    monkeypatch.setattr(model_inference, "_retry_delay", lambda attempt: 0)
+    AgentGenerator.close_pool()
+    yield llm
+    AgentGenerator.close_pool()
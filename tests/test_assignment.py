@@ -0,0 +1,35 @@
+from multi_agent_generator.assignment import assign_agents
+
+AGENTS = [
+    {"name": "researcher", "role": "Research Specialist"},
+    {"name": "writer", "role": "Report Writer"},
+]
+
+
+def test_unassigned_tasks_are_matched_by_keyword():
+    config = {"agents": AGENTS, "tasks": [{"name": "draft the summary"}, {"name": "investigate sources"}]}
+    assign_agents(config)
+    assert [t["agent"] for t in config["tasks"]] == ["writer", "researcher"]
+
+
+def test_existing_assignments_are_kept():
+    config = {"agents": AGENTS, "tasks": [{"name": "draft the summary", "agent": "researcher"}]}
+    assign_agents(config)
+    assert config["tasks"][0]["agent"] == "researcher"
+
+
+def test_unhashable_agent_values_are_reassigned():
+    config = {
+        "agents": AGENTS,
+        "tasks": [{"name": "write the report", "agent": ["writer"]}, {"name": "plan", "agent": {"name": "x"}}],
+    }
+    assign_agents(config)
+    assert config["tasks"][0]["agent"] == "writer"
+    # No agent fits; left for the code generators' fallback
+    assert config["tasks"][1]["agent"] == {"name": "x"}
+
+
+def test_malformed_configs_are_left_alone():
+    config = {"agents": "researcher", "tasks": [{"name": "research"}]}
+    assign_agents(config)
+    assert config == {"agents": "researcher", "tasks": [{"name": "research"}]}
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from multi_agent_generator.batching import AsyncTokenBucket, RequestBatcher
+
+
+def test_requests_are_batched_and_answered_in_order():
+    async def main():
+        batcher = RequestBatcher(max_batch=4, window=0.01)
+
+        async def echo(value):
+            return value
+
+        return await asyncio.gather(*(batcher.submit(lambda v=v: echo(v)) for v in range(10)))
+
+    assert asyncio.run(main()) == list(range(10))
+
+
+def test_errors_reach_the_caller():
+    async def main():
+        async def fail():
+            raise KeyError("missing")
+
+        return await RequestBatcher(window=0).submit(fail)
+
+    with pytest.raises(KeyError):
+        asyncio.run(main())
+
+
+def test_cancelled_call_cancels_the_caller():
+    async def main():
+        async def cancelled():
+            raise asyncio.CancelledError()
+
+        await asyncio.wait_for(RequestBatcher(window=0).submit(cancelled), timeout=1)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(main())
+
+
+@pytest.mark.parametrize("rate, burst", [(0, 10), (-1, 10), (10, 0.5)])
+def test_token_bucket_rejects_invalid_limits(rate, burst):
+    with pytest.raises(ValueError):
+        AsyncTokenBucket(rate=rate, burst=burst)
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from multi_agent_generator.__main__ import _build_parser, parse_args
+
+# Tokens the fuzzed command lines are drawn from: every option, valid and
+# invalid values, option-like values and prompts
+TOKENS = [
+    "--framework", "--framework=react", "--framework=bogus", "--process", "--process=hierarchical",
+    "--provider", "--provider=ollama", "--output", "--output=out.py", "--output=", "--format",
+    "--format=json", "--no-cache", "--no-cache=1", "--semantic-cache", "--frame", "--unknown",
+    "-x", "-", "--", "crewai", "langgraph", "auto", "sequential", "hierarchical", "json", "both",
+    "openai", "out.py", "A research crew", "Build a team", "-1",
+]
+
+
+def _outcome(parse, argv):
+    try:
+        return vars(parse(argv))
+    except SystemExit as e:
+        return ("exit", e.code)
+
+
+@pytest.mark.parametrize("argv", [
+    ["A research crew"],
+    ["A research crew", "--framework", "langgraph", "--no-cache"],
+    ["--output", "--no-cache", "A research crew"],
+    ["--provider", "-x", "A research crew"],
+    ["--framework=react", "--format", "both", "A research crew", "--output=out.py"],
+    ["A research crew", "--framework"],
+    ["A research crew", "Another prompt"],
+])
+def test_parse_args_matches_argparse(argv, capsys):
+    assert _outcome(parse_args, argv) == _outcome(_build_parser().parse_args, argv)
+
+
+def test_parse_args_matches_argparse_on_random_command_lines(capsys):
+    rng = random.Random(0)
+    parser = _build_parser()
+    for _ in range(3000):
+        argv = rng.choices(TOKENS, k=rng.randint(0, 6))
+        assert _outcome(parse_args, argv) == _outcome(parser.parse_args, argv), argv
@@ -0,0 +1,189 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+from conftest import CREWAI_CONFIG
+from multi_agent_generator.generator import AgentGenerator, _env_int
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_warmup_sets_up_the_model_and_connects(fake_llm, monkeypatch):
+    monkeypatch.setenv("MAG_WARMUP", "1")
+    generator = AgentGenerator()
+    generator.set_provider("openai")
+    assert _wait_for(lambda: fake_llm.calls)
+    assert fake_llm.calls[0]["max_tokens"] == 1
+    assert generator.model is not None
+
+
+def test_stale_warmup_keeps_its_model_to_itself(fake_llm):
+    generator = AgentGenerator(provider="ollama")
+    # A warm-up started for openai before the provider was switched
+    generator._warmup("openai")
+    assert generator.model is None
+    assert _wait_for(lambda: fake_llm.calls)
+
+
+def test_soft_timeout_is_off_by_default(fake_llm):
+    assert not AgentGenerator().soft_timeout
+
+
+def test_malformed_soft_timeout_is_ignored(fake_llm, monkeypatch):
+    monkeypatch.setenv("AGENT_SOFT_TIMEOUT", "soon")
+    assert AgentGenerator().soft_timeout == 0
+
+
+def test_soft_timeout_returns_default_and_caches_late_result(fake_llm):
+    fake_llm.delay = 0.5
+    generator = AgentGenerator(soft_timeout=0.05)
+    config = generator.analyze_prompt("A research crew", "crewai")
+    assert config["agents"][0]["name"] != "researcher"
+
+    time.sleep(1.0)
+    config = generator.analyze_prompt("A research crew", "crewai")
+    assert config["agents"][0]["name"] == "researcher"
+    assert len(fake_llm.calls) == 1
+
+
+def test_soft_timeout_does_not_delay_exit():
+    script = textwrap.dedent("""
+        import os, time
+        os.environ["OPENAI_API_KEY"] = "sk-test"
+        os.environ["LITELLM_LOCAL_MODEL_COST_MAP"] = "True"
+        from multi_agent_generator import model_inference
+        from multi_agent_generator.generator import AgentGenerator, _env_int
+
+        def slow_completion(**kwargs):
+            time.sleep(60)
+
+        model_inference.completion = slow_completion
+        AgentGenerator(soft_timeout=0.1).analyze_prompt("A research crew", "crewai")
+    """)
+    env = {**os.environ, "PYTHONPATH": ROOT}
+    # Far less than the 60s the abandoned request would take
+    subprocess.run([sys.executable, "-c", script], env=env, check=True, timeout=45)
+
+
+def test_analyze_prompt_returns_model_config(fake_llm):
+    config = AgentGenerator().analyze_prompt("A research crew", "crewai")
+    assert config["agents"][0]["name"] == "researcher"
+    assert len(fake_llm.calls) == 1
+
+
+def test_analyses_are_cached_across_case_and_spacing(fake_llm):
+    generator = AgentGenerator()
+    first = generator.analyze_prompt("A research crew", "crewai")
+    first["process"] = "hierarchical"
+    second = generator.analyze_prompt("a  research CREW", "crewai")
+    assert len(fake_llm.calls) == 1
+    # Callers get copies, so changing one does not change the cache
+    assert "process" not in second
+
+
+def test_expired_analyses_are_not_reused(fake_llm, monkeypatch):
+    monkeypatch.setenv("AGENT_CACHE_TTL", "0")
+    generator = AgentGenerator()
+    generator.analyze_prompt("A research crew", "crewai")
+    generator.analyze_prompt("A research crew", "crewai")
+    assert len(fake_llm.calls) == 2
+
+
+def test_analyses_persist_in_cache_dir(fake_llm, tmp_path):
+    AgentGenerator(cache_dir=str(tmp_path)).analyze_prompt("A research crew", "crewai")
+    config = AgentGenerator(cache_dir=str(tmp_path)).analyze_prompt("A research crew", "crewai")
+    assert config["agents"][0]["name"] == "researcher"
+    assert len(fake_llm.calls) == 1
+
+
+def test_malformed_cache_ttl_is_ignored(fake_llm, monkeypatch):
+    monkeypatch.setenv("AGENT_CACHE_TTL", "a day")
+    generator = AgentGenerator()
+    generator.analyze_prompt("A research crew", "crewai")
+    generator.analyze_prompt("A research crew", "crewai")
+    assert len(fake_llm.calls) == 1
+
+
+def test_env_int_tolerates_malformed_values(monkeypatch):
+    monkeypatch.setenv("AGENT_CONCURRENCY", "many")
+    assert _env_int("AGENT_CONCURRENCY", 8) == 8
+    monkeypatch.setenv("AGENT_CONCURRENCY", "0")
+    assert _env_int("AGENT_CONCURRENCY", 8) == 1
+
+
+def test_import_and_help_survive_malformed_concurrency():
+    env = {**os.environ, "PYTHONPATH": ROOT, "AGENT_CONCURRENCY": "many", "LITELLM_LOCAL_MODEL_COST_MAP": "True"}
+    subprocess.run(
+        [sys.executable, "-m", "multi_agent_generator", "--help"], env=env, check=True, capture_output=True
+    )
+
+
+def test_analyze_many_answers_in_order(fake_llm, monkeypatch):
+    monkeypatch.setenv("AGENT_CONCURRENCY", "2")
+    items = [("A research crew", "crewai"), ("A writing crew", "crewai"), ("A research crew", "crewai")]
+    configs = AgentGenerator().analyze_prompts_batch(items)
+    assert [c["agents"][0]["name"] for c in configs] == ["researcher"] * 3
+    # The repeated item is analyzed once but handed out as a separate copy
+    assert len(fake_llm.calls) == 2
+    assert configs[0] is not configs[2]
+
+
+def test_unhashable_agent_falls_back_instead_of_raising(fake_llm):
+    fake_llm.reply = json.dumps({
+        "agents": [{"name": "writer", "role": "Report Writer"}],
+        "tasks": [{"name": "write the report", "agent": ["writer"]}],
+    })
+    config = AgentGenerator().analyze_prompt("A writing crew", "crewai")
+    assert config["tasks"][0]["agent"] == "writer"
+
+
+def _batched_reply(request):
+    prompts = request["messages"][-1]["content"].count("\n") - 2
+    return json.dumps({"configs": [CREWAI_CONFIG] * prompts})
+
+
+def test_batched_analysis_stays_under_output_cap(fake_llm):
+    fake_llm.reply = _batched_reply
+    prompts = [f"Crew number {i}" for i in range(10)]
+    configs = AgentGenerator().analyze_prompts_batched(prompts, "crewai", max_tokens=4000)
+    assert [c["agents"][0]["name"] for c in configs] == ["researcher"] * 10
+    assert len(fake_llm.calls) == 4
+    assert all(call["max_tokens"] <= 4000 for call in fake_llm.calls)
+    assert all(call["messages"][0]["role"] == "system" for call in fake_llm.calls)
+
+
+def test_batched_analysis_warns_once_per_failed_chunk(fake_llm, caplog):
+    fake_llm.errors = [ValueError("output limit exceeded")]
+    fake_llm.reply = _batched_reply
+    prompts = [f"Crew number {i}" for i in range(5)]
+    with caplog.at_level(logging.WARNING, logger="multi_agent_generator.generator"):
+        configs = AgentGenerator().analyze_prompts_batched(prompts, "crewai", max_tokens=3600)
+    assert len(caplog.records) == 1
+    assert [c["agents"][0]["name"] == "researcher" for c in configs] == [False] * 3 + [True] * 2
+
+
+def test_batched_analysis_skips_cached_and_repeated_prompts(fake_llm):
+    generator = AgentGenerator()
+    generator.analyze_prompt("Cached crew", "crewai")
+    fake_llm.reply = _batched_reply
+    configs = generator.analyze_prompts_batched(["Cached crew", "New crew", "New crew"], "crewai")
+    assert len(configs) == 3
+    assert len(fake_llm.calls) == 2
+    assert fake_llm.calls[1]["messages"][-1]["content"].endswith("1) New crew\n")
+
+
+def test_persisted_analyses_leave_no_temp_files(fake_llm, tmp_path):
+    AgentGenerator(cache_dir=str(tmp_path)).analyze_prompt("A research crew", "crewai")
+    [entry] = os.listdir(tmp_path)
+    assert entry.endswith(".json")
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from multi_agent_generator.generator import _JsonObjectScanner, _decode_first_object, _extract_json
+
+# An object whose strings hold braces, quotes and escapes the scanner must skip
+OBJECT = {"agents": [{"name": "a}{", "goal": 'say "hi" {now}', "path": "C:\\tmp\\"}], "n": 1}
+TEXT = json.dumps(OBJECT)
+
+
+def _feed(chunks):
+    scanner = _JsonObjectScanner()
+    for chunk in chunks:
+        obj = scanner.feed(chunk)
+        if obj is not None:
+            return obj
+    return None
+
+
+@pytest.mark.parametrize("text", [
+    TEXT,
+    f"Here is the config:\n```json\n{TEXT}\n```\nLet me know if it helps.",
+    f'The "config" follows. {TEXT} {{"trailing": true}}',
+])
+def test_scanner_finds_the_first_object(text):
+    assert _feed([text]) == OBJECT
+
+
+def test_scanner_finds_the_object_at_every_chunk_boundary():
+    text = f"Sure! {TEXT} done"
+    for cut in range(len(text) + 1):
+        assert _feed([text[:cut], text[cut:]]) == OBJECT, cut
+
+
+def test_scanner_finds_the_object_one_character_at_a_time():
+    assert _feed(f"ok {TEXT}") == OBJECT
+
+
+def test_scanner_waits_for_the_closing_brace():
+    scanner = _JsonObjectScanner()
+    assert scanner.feed(TEXT[:-1]) is None
+    assert scanner.feed(TEXT[-1:] + " more") == OBJECT
+    assert scanner.text == TEXT + " more"
+
+
+def test_scanner_gives_up_on_an_object_that_does_not_decode():
+    scanner = _JsonObjectScanner()
+    # The stray "{}" closes first and is not a config
+    assert scanner.feed("Use {} for an empty dict. " + TEXT) is None
+    assert scanner.feed(" {}") is None
+
+
+@pytest.mark.parametrize("text", [
+    "Use {} for an empty dict. " + TEXT,
+    "A brace { in the prose, then " + TEXT,
+    "Not JSON: {agents: []} but this is: " + TEXT,
+])
+def test_extract_json_falls_back_when_prose_throws_off_the_scan(text):
+    assert _extract_json(text) == OBJECT
+    assert _decode_first_object(text) == OBJECT
+
+
+@pytest.mark.parametrize("text", ["", "no object here", "{}", "[1, 2]", '{"unclosed": 1'])
+def test_extract_json_returns_none_without_an_object(text):
+    assert _extract_json(text) is None
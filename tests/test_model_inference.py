@@ -0,0 +1,193 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import litellm
+import pytest
+
+from multi_agent_generator import model_inference
+from multi_agent_generator.batching import RequestBatcher
+from multi_agent_generator.model_inference import _BATCH_ENDPOINTS, ModelInference, is_retryable
+from multi_agent_generator.response_cache import MemoryBackend
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _import_with(env):
+    """Value of ``litellm.cache`` after importing the package with ``env`` set."""
+    script = "import litellm, multi_agent_generator.model_inference; print(type(litellm.cache).__name__)"
+    env = {**os.environ, "PYTHONPATH": ROOT, "LITELLM_LOCAL_MODEL_COST_MAP": "True", **env}
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_litellm_cache_needs_an_explicit_opt_in():
+    assert _import_with({"LITELLM_CACHE": "0"}) == "NoneType"
+
+
+def test_malformed_litellm_cache_settings_do_not_break_import():
+    env = {"LITELLM_CACHE": "1", "LITELLM_CACHE_TYPE": "local", "LITELLM_CACHE_TTL": "an hour"}
+    assert _import_with(env) == "Cache"
+
+
+def test_redis_settings_are_parsed(monkeypatch):
+    settings = {}
+    monkeypatch.setattr(
+        model_inference, "configure_litellm_cache", lambda cache_type, ttl, **args: settings.update(args, ttl=ttl)
+    )
+    monkeypatch.setenv("LITELLM_CACHE_TYPE", "redis")
+    monkeypatch.setenv("REDIS_PORT", "6380")
+    monkeypatch.setenv("LITELLM_CACHE_TTL", "nope")
+    model_inference._configure_litellm_cache_from_env()
+    assert settings["port"] == 6380
+    assert settings["ttl"] == 3600.0
+
+
+def test_only_deterministic_calls_use_the_litellm_cache(fake_llm, monkeypatch):
+    monkeypatch.setattr(litellm, "cache", litellm.Cache(type="local"))
+    model = ModelInference("gpt-4o-mini", temperature=0)
+    assert "cache" not in model._request(MESSAGES, {})
+    assert model._request(MESSAGES, {"temperature": 0.7})["cache"] == {"no-cache": True, "no-store": True}
+
+
+def test_repeated_deterministic_calls_hit_the_response_cache(fake_llm):
+    fake_llm.reply = "cached"
+    model = ModelInference("gpt-4o-mini", api_key=["k1", "k2"], response_cache=MemoryBackend(), temperature=0)
+    assert model.generate_text(MESSAGES) == "cached"
+    # Another endpoint does not change the completion
+    assert model.generate_text(MESSAGES) == "cached"
+    assert asyncio.run(model.agenerate_text(MESSAGES)) == "cached"
+    assert len(fake_llm.calls) == 1
+    assert model.cache_stats == {"hits": 2, "misses": 1}
+
+
+def test_response_cache_keys_cover_messages_and_parameters(fake_llm):
+    model = ModelInference("gpt-4o-mini", response_cache=MemoryBackend(), temperature=0)
+    model.generate_text(MESSAGES)
+    model.generate_text([{"role": "user", "content": "hello"}])
+    model.generate_text(MESSAGES, max_tokens=10)
+    assert len(fake_llm.calls) == 3
+    assert model.cache_stats == {"hits": 0, "misses": 3}
+
+
+def test_sampled_and_streamed_calls_skip_the_response_cache(fake_llm):
+    cache = MemoryBackend()
+    model = ModelInference("gpt-4o-mini", response_cache=cache, temperature=0)
+    model.generate_text(MESSAGES, temperature=0.7)
+    model.generate_text(MESSAGES, temperature=0.7)
+    "".join(model.generate_text_stream(MESSAGES))
+    assert len(fake_llm.calls) == 3
+    assert len(cache) == 0
+    assert model.cache_stats == {"hits": 0, "misses": 0}
+
+
+def test_failed_calls_are_not_cached(fake_llm):
+    fake_llm.errors = [ValueError("bad request")]
+    cache = MemoryBackend()
+    model = ModelInference("gpt-4o-mini", response_cache=cache, temperature=0)
+    with pytest.raises(RuntimeError):
+        model.generate_text(MESSAGES)
+    assert len(cache) == 0
+
+
+def test_requests_rotate_over_api_keys(fake_llm):
+    model = ModelInference("gpt-4o-mini", api_key=["k1", "k2"])
+    for _ in range(3):
+        model.generate_text(MESSAGES)
+    assert [call["api_key"] for call in fake_llm.calls] == ["k1", "k2", "k1"]
+
+
+def test_keys_and_endpoints_are_paired(fake_llm):
+    model = ModelInference("gpt-4o-mini", api_key=["k1", "k2"], api_base=["https://a", "https://b"])
+    assert model.endpoints == (("k1", "https://a"), ("k2", "https://b"))
+
+
+@pytest.mark.parametrize("settings", [
+    {"api_key": []},
+    {"api_base": []},
+    {"api_key": ["k1", "k2"], "api_base": ["https://a", "https://b", "https://c"]},
+])
+def test_invalid_endpoint_lists_are_rejected(fake_llm, settings):
+    with pytest.raises(ValueError):
+        ModelInference("gpt-4o-mini", **settings)
+
+
+def _rate_limit():
+    return litellm.RateLimitError("slow down", llm_provider="openai", model="gpt-4o-mini")
+
+
+def test_transient_errors_are_retried(fake_llm):
+    fake_llm.errors = [_rate_limit(), _rate_limit()]
+    fake_llm.reply = "ok"
+    model = ModelInference("gpt-4o-mini")
+    assert model.generate_text(MESSAGES) == "ok"
+    assert len(fake_llm.calls) == 3
+
+
+def test_async_calls_are_retried(fake_llm):
+    fake_llm.errors = [_rate_limit()]
+    fake_llm.reply = "ok"
+    model = ModelInference("gpt-4o-mini", batcher=RequestBatcher(window=0))
+    assert asyncio.run(model.agenerate_text(MESSAGES)) == "ok"
+    assert len(fake_llm.calls) == 2
+
+
+def test_retries_give_up_after_retry_attempts(fake_llm):
+    fake_llm.errors = [_rate_limit() for _ in range(5)]
+    model = ModelInference("gpt-4o-mini", retry_attempts=2)
+    with pytest.raises(RuntimeError) as excinfo:
+        model.generate_text(MESSAGES)
+    assert is_retryable(excinfo.value)
+    assert len(fake_llm.calls) == 2
+
+
+def test_other_errors_are_not_retried(fake_llm):
+    fake_llm.errors = [ValueError("bad request")]
+    model = ModelInference("gpt-4o-mini")
+    with pytest.raises(RuntimeError):
+        model.generate_text(MESSAGES)
+    assert len(fake_llm.calls) == 1
+
+
+def test_stream_opening_is_retried(fake_llm):
+    fake_llm.errors = [_rate_limit()]
+    fake_llm.reply = "streamed"
+    model = ModelInference("gpt-4o-mini")
+    assert "".join(model.generate_text_stream(MESSAGES)) == "streamed"
+    assert len(fake_llm.calls) == 2
+
+
+def test_batch_lines_carry_only_chat_completion_parameters(fake_llm):
+    model = ModelInference(
+        "gpt-4o-mini", project_id=None, prompt_cache_key="crewai", temperature=0.7, max_tokens=100
+    )
+    [line] = model._batch_lines(["hi"], "gpt-4o-mini", _BATCH_ENDPOINTS["openai"], {"seed": 1})
+    assert json.loads(line) == {
+        "custom_id": "0",
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": "gpt-4o-mini",
+            "messages": MESSAGES,
+            "temperature": 0.7,
+            "max_tokens": 100,
+            "seed": 1,
+        },
+    }
+
+
+def test_azure_batch_lines_name_the_deployment(fake_llm):
+    model = ModelInference("azure/my-deployment", api_key="k", api_base="https://example.openai.azure.com")
+    [line] = model._batch_lines(["hi"], "my-deployment", _BATCH_ENDPOINTS["azure"], {})
+    request = json.loads(line)
+    assert request["url"] == "/chat/completions"
+    assert request["body"]["model"] == "my-deployment"
+
+
+def test_generate_batch_rejects_unsupported_providers(fake_llm):
+    with pytest.raises(ValueError):
+        ModelInference("ollama/llama3").generate_batch(["hi"])
@@ -0,0 +1,5 @@
+def test_package_exports_resolve():
+    import multi_agent_generator
+
+    for name in multi_agent_generator.__all__:
+        assert getattr(multi_agent_generator, name) is not None
@@ -0,0 +1,62 @@
+import hashlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from multi_agent_generator.prompt_cache import SemanticCache
+
+
+class CountingEncoder:
+    """Deterministic random unit vectors per prompt; counts the prompts embedded."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, prompt, normalize_embeddings=True):
+        self.calls += 1
+        seed = int(hashlib.sha256(prompt.encode()).hexdigest()[:8], 16)
+        vector = np.random.default_rng(seed).normal(size=32)
+        return vector / np.linalg.norm(vector)
+
+
+def _cache(directory):
+    cache = SemanticCache(str(directory))
+    cache._encoder = CountingEncoder()
+    return cache
+
+
+def test_miss_then_put_embeds_once(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("seed prompt", "ns", {"n": 0})
+    cache._encoder.calls = 0
+    assert cache.get("another prompt", "ns") is None
+    cache.put("another prompt", "ns", {"n": 1})
+    assert cache._encoder.calls == 1
+
+
+def test_entries_are_appended_and_reloaded(tmp_path):
+    cache = _cache(tmp_path)
+    for i in range(20):
+        cache.get(f"prompt {i}", "ns")
+        cache.put(f"prompt {i}", "ns", {"n": i})
+    with open(tmp_path / "entries.jsonl") as f:
+        assert len(f.readlines()) == 20
+
+    reloaded = _cache(tmp_path)
+    assert reloaded.get("PROMPT 7 ", "ns") == {"n": 7}
+    assert reloaded._encoder.calls == 0
+    assert reloaded.get("prompt 7", "other") is None
+
+
+def test_truncated_line_is_skipped(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("first", "ns", {"n": 1})
+    with open(tmp_path / "entries.jsonl", "a") as f:
+        f.write('{"namespace": "ns", "pro')
+
+    reloaded = _cache(tmp_path)
+    reloaded.put("second", "ns", {"n": 2})
+    again = _cache(tmp_path)
+    assert again.get("first", "ns") == {"n": 1}
+    assert again.get("second", "ns") == {"n": 2}
@@ -0,0 +1,23 @@
+from multi_agent_generator.response_cache import MemoryBackend
+
+
+def test_memory_backend_evicts_the_least_recently_used_response():
+    cache = MemoryBackend(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+    assert len(cache) == 2
+
+
+def test_memory_backend_overwrites_and_clears():
+    cache = MemoryBackend()
+    cache.set("a", "1")
+    cache.set("a", "2")
+    assert cache.get("a") == "2"
+    assert len(cache) == 1
+    cache.clear()
+    assert cache.get("a") is None
+    assert len(cache) == 0
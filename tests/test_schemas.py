@@ -0,0 +1,80 @@
+import sys
+
+import pytest
+
+from multi_agent_generator import schemas
+from multi_agent_generator.schemas import copy_config, normalize_config, response_format_for, validator_for
+
+from conftest import CREWAI_CONFIG
+
+LANGGRAPH_CONFIG = {
+    "agents": [{"name": "a", "role": "r", "llm": "gpt-4o", "tools": ["search"]}],
+    "nodes": [{"name": "a", "agent": "a"}],
+    "edges": [{"source": "a", "target": "END"}],
+}
+
+
+def test_normalize_config_returns_an_equal_independent_copy():
+    config = normalize_config("crewai", CREWAI_CONFIG)
+    assert config == CREWAI_CONFIG
+    config["agents"][0]["name"] = "changed"
+    config["tasks"].append({"name": "extra"})
+    assert CREWAI_CONFIG["agents"][0]["name"] == "researcher"
+    assert len(CREWAI_CONFIG["tasks"]) == 1
+
+
+@pytest.mark.parametrize("framework, config, message", [
+    ("crewai", [], "data must be object"),
+    ("crewai", {"agents": []}, "data must contain tasks"),
+    ("crewai", {"agents": {}, "tasks": []}, "data.agents must be array"),
+    ("crewai", {"agents": [{"role": "r"}], "tasks": []}, r"data.agents\[0\] must contain name"),
+    ("crewai", {"agents": [{"name": 1}], "tasks": []}, r"data.agents\[0\].name must be string"),
+    ("langgraph", dict(LANGGRAPH_CONFIG, edges=[{"source": "a"}]), r"data.edges\[0\] must contain target"),
+    ("langgraph", dict(LANGGRAPH_CONFIG, agents=[dict(LANGGRAPH_CONFIG["agents"][0], tools="search")]),
+     r"data.agents\[0\].tools must be array"),
+    ("react", {"agents": [{"role": "r"}]}, r"data.agents\[0\] must contain goal"),
+])
+def test_normalize_config_rejects_invalid_configs(framework, config, message):
+    with pytest.raises(ValueError, match=message):
+        normalize_config(framework, config)
+
+
+def test_normalize_config_copies_frameworks_without_a_schema_unchecked():
+    config = {"anything": [{"goes": 1}]}
+    copied = normalize_config("custom", config)
+    assert copied == config
+    assert copied["anything"][0] is not config["anything"][0]
+
+
+def test_copy_config_copies_nested_containers():
+    copied = copy_config(LANGGRAPH_CONFIG)
+    assert copied == LANGGRAPH_CONFIG
+    assert copied["agents"][0]["tools"] is not LANGGRAPH_CONFIG["agents"][0]["tools"]
+
+
+@pytest.fixture(params=["builtin", "fastjsonschema"])
+def validator_backend(request, monkeypatch):
+    if request.param == "fastjsonschema":
+        pytest.importorskip("fastjsonschema")
+    else:
+        monkeypatch.setitem(sys.modules, "fastjsonschema", None)
+    validator_for.cache_clear()
+    yield
+    validator_for.cache_clear()
+
+
+def test_validator_for_accepts_valid_and_rejects_invalid_configs(validator_backend):
+    validate = validator_for("langgraph")
+    validate(LANGGRAPH_CONFIG)
+    with pytest.raises(ValueError):
+        validate({"agents": [], "nodes": []})
+    assert validator_for("custom") is None
+
+
+def test_response_format_for_wraps_the_schema():
+    response_format = response_format_for("crewai-flow")
+    assert response_format == {
+        "type": "json_schema",
+        "json_schema": {"name": "crewai_flow_config", "schema": schemas.CONFIG_SCHEMAS["crewai-flow"]},
+    }
+    assert response_format_for("custom") is None